@@ -5,7 +5,7 @@ Streamlit-basiertes HR-Analytics-Dashboard für eine süddeutsche Sparkasse/Bank
 """
 
 import streamlit as st
-from config.settings import PAGE_CONFIG, DEFAULT_COHORTS
+from config.settings import PAGE_CONFIG, SESSION_STATE_DEFAULTS
 
 # =============================================================================
 # PAGE CONFIGURATION
@@ -18,38 +18,10 @@ st.set_page_config(**PAGE_CONFIG)
 # =============================================================================
 
 def initialize_session_state():
-    """Initialisiert Session State mit Defaults."""
-
-    # Kohorten-Definitionen
-    if "cohort_definitions" not in st.session_state:
-        st.session_state["cohort_definitions"] = DEFAULT_COHORTS.copy()
-
-    # View Mode (MAK oder Euro)
-    if "view_mode" not in st.session_state:
-        st.session_state["view_mode"] = "MAK"
-
-    # Filter-Defaults
-    if "selected_genders" not in st.session_state:
-        st.session_state["selected_genders"] = ["m", "w"]
-
-    if "selected_employment" not in st.session_state:
-        st.session_state["selected_employment"] = ["Vollzeit", "Teilzeit"]
-
-    if "selected_atz_status" not in st.session_state:
-        st.session_state["selected_atz_status"] = ["Kein ATZ", "Arbeitsphase", "Freistellungsphase"]
-
-    # Weitere Filter (werden in Sidebar dynamisch gesetzt)
-    if "selected_org_units" not in st.session_state:
-        st.session_state["selected_org_units"] = []
-
-    if "selected_cohorts" not in st.session_state:
-        st.session_state["selected_cohorts"] = []
-
-    if "selected_education" not in st.session_state:
-        st.session_state["selected_education"] = []
-
-    if "date_range" not in st.session_state:
-        st.session_state["date_range"] = None
+    """Initialisiert Session State mit Defaults (nur fehlende Keys)."""
+    for key, default in SESSION_STATE_DEFAULTS.items():
+        # Listen/Dicts kopieren, damit die Defaults nicht mitverändert werden
+        st.session_state.setdefault(key, default.copy() if hasattr(default, "copy") else default)
 
 
 # =============================================================================
@@ -2,59 +2,187 @@
 Chart-Factory für alle Plotly-Visualisierungen.
 
 Konsistente, wiederverwendbare Chart-Funktionen.
+
+Factories mit reinen Listen-/Skalar-Argumenten (Gauge, Funnel, Waterfall)
+sind mit `@st.cache_data` gecacht. Factories mit DataFrame-Eingabe bleiben
+ungecacht: der inhaltliche Hash des DataFrames kostet bei jedem Aufruf
+mindestens so viel wie der Aufbau der Figure. Zusammen mit einem stabilen
+`key` in `st.plotly_chart` aktualisiert das Frontend den Plot per
+Plotly.react (Diff) statt ihn komplett neu aufzubauen.
 """
 
 import plotly.graph_objects as go
+import numpy as np
 import pandas as pd
+import streamlit as st
+from functools import lru_cache
+from itertools import cycle, islice
 from typing import Optional, List
-import sys
-import os
 
-# Import settings
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.settings import (
     COLORS, COLOR_SEQUENCE, COHORT_COLORS,
     CHART_HEIGHTS
 )
 
+# Häufig genutzte Theme-Farben einmalig binden
+_TEXT_PRIMARY = COLORS["text_primary"]
+_TEXT_SECONDARY = COLORS["text_secondary"]
+_CARD_BG = COLORS["card_bg"]
+_CARD_BORDER = COLORS["card_border"]
+_BG = COLORS["background"]
+_ACCENT = COLORS["accent_teal"]
+_GOOD = COLORS["status_good"]
+_WARN = COLORS["status_warning"]
+_CRIT = COLORS["status_critical"]
+_MALE = COLORS["gender_male"]
+_FEMALE = COLORS["gender_female"]
+
+
+def _colors_for(n: int) -> List[str]:
+    """
+    Liefert n Farben aus COLOR_SEQUENCE (zyklisch wiederholt).
 
-def get_base_layout(title: str = "", show_legend: bool = True) -> dict:
+    Args:
+        n: Anzahl benötigter Farben
+
+    Returns:
+        Liste mit n Farbcodes
     """
-    Basis-Layout für alle Charts.
+    return list(islice(cycle(COLOR_SEQUENCE), n))
+
+
+def _to_plot_dtype(values) -> np.ndarray:
+    """
+    Wandelt numerische Werte in float32 um (halbiert die Plotly-Payload),
+    sofern dabei kein Wert verloren geht.
+
+    Kostensummen im Millionenbereich sind in float32 auf Euro-Beträge
+    ungenau und bleiben daher im Ursprungs-dtype (wie _downcast_lossless
+    im Loader). Kategorische, Text- und Datumswerte bleiben unverändert.
 
     Args:
-        title: Chart-Titel
-        show_legend: Ob Legende angezeigt werden soll
+        values: Series, Array oder Liste
 
     Returns:
-        Layout-Dictionary
+        NumPy-Array
     """
+    arr = np.asarray(values)
+    if arr.dtype.kind in "iuf":
+        downcast = arr.astype(np.float32, copy=False)
+        if np.array_equal(downcast, arr, equal_nan=arr.dtype.kind == "f"):
+            return downcast
+    return arr
+
+
+def _use_webgl(n_points: int, render_mode: str) -> bool:
+    """
+    Entscheidet, ob Scatter-Traces per WebGL (Scattergl) gerendert werden.
+
+    Args:
+        n_points: Anzahl darzustellender Punkte
+        render_mode: "auto" (ab WEBGL_MIN_POINTS), "webgl" oder "svg"
+
+    Returns:
+        True wenn Scattergl verwendet werden soll
+    """
+    if render_mode == "auto":
+        return n_points > WEBGL_MIN_POINTS
+    return render_mode == "webgl"
+
+
+def _format_signed(values) -> np.ndarray:
+    """
+    Formatiert Werte vektorisiert mit Vorzeichen und einer Nachkommastelle.
+
+    Args:
+        values: Numerische Werte
+
+    Returns:
+        NumPy-String-Array (z.B. "+1.5", "-2.0")
+    """
+    return np.char.mod("%+.1f", np.asarray(values, dtype=np.float64))
+
+
+# Cache für Chart-Factories mit günstig hashbaren Argumenten (Listen, Skalare);
+# TTL und max_entries begrenzen den Speicher bei vielen Filterkombinationen.
+_cache_chart = st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+
+# Ab dieser Punktanzahl rendern Linien-/Flächencharts per WebGL statt SVG
+WEBGL_MIN_POINTS = 2000
+
+# Statische Layout-Teile (einmalig beim Import aufgebaut)
+_STATIC_BASE_LAYOUT = {
+    "plot_bgcolor": "rgba(255,255,255,0)",
+    "paper_bgcolor": "rgba(255,255,255,0)",
+    "font": {"color": _TEXT_PRIMARY, "size": 12},
+    "margin": dict(l=60, r=40, t=90, b=60),
+    "hovermode": "closest",
+}
+
+_LEGEND_LAYOUT = {
+    "orientation": "h",
+    "yanchor": "bottom",
+    "y": 1.02,
+    "xanchor": "center",
+    "x": 0.5,
+    "bgcolor": "#FFFFFF",
+    "bordercolor": "rgba(0,0,0,0)",
+    "borderwidth": 0
+}
+
+# Achsen-Stile (geteilt von allen Factories, nicht verändern)
+_AXIS_STYLE = {"gridcolor": _CARD_BORDER}
+_AXIS_REVERSED = {**_AXIS_STYLE, "autorange": "reversed"}
+_HEATMAP_XAXIS = {"side": "bottom"}
+_HEATMAP_YAXIS = {"autorange": "reversed"}
+_PYRAMID_XAXIS = {**_AXIS_STYLE, "title": "Anzahl"}
+_PYRAMID_YAXIS = {**_AXIS_STYLE, "title": "Alter"}
+_GANTT_XAXIS = {**_AXIS_STYLE, "type": "date"}
+_WATERFALL_YAXIS = {**_AXIS_STYLE, "title": "FTE"}
+_DIVERGING_XAXIS = {
+    **_AXIS_STYLE,
+    "title": "Varianz (FTE)",
+    "zeroline": True,
+    "zerolinecolor": _TEXT_SECONDARY,
+    "zerolinewidth": 2
+}
+
+
+@lru_cache(maxsize=256)
+def _cached_base_layout(title: str, show_legend: bool) -> dict:
+    """Baut das Basis-Layout einmal pro (title, show_legend) auf."""
     return {
         "title": {
             "text": title,
-            "font": {"size": 16, "color": COLORS["text_primary"]},
+            "font": {"size": 16, "color": _TEXT_PRIMARY},
             "x": 0.5,
             "xanchor": "center"
         },
-        "plot_bgcolor": "rgba(255,255,255,0)",
-        "paper_bgcolor": "rgba(255,255,255,0)",
-        "font": {"color": COLORS["text_primary"], "size": 12},
-        "margin": dict(l=60, r=40, t=90, b=60),
-        "hovermode": "closest",
+        **_STATIC_BASE_LAYOUT,
         "showlegend": show_legend,
-        "legend": {
-            "orientation": "h",
-            "yanchor": "bottom",
-            "y": 1.02,
-            "xanchor": "center",
-            "x": 0.5,
-            "bgcolor": "#FFFFFF",
-            "bordercolor": "rgba(0,0,0,0)",
-            "borderwidth": 0
-        }
+        "legend": _LEGEND_LAYOUT
     }
 
 
+def get_base_layout(title: str = "", show_legend: bool = True) -> dict:
+    """
+    Basis-Layout für alle Charts.
+
+    Das Layout wird pro (title, show_legend) gecacht. Zurückgegeben wird eine
+    flache Kopie: Top-Level-Keys (height, xaxis, ...) dürfen gesetzt werden,
+    verschachtelte Dicts (title, legend, ...) sind geteilt und dürfen nicht
+    verändert werden.
+
+    Args:
+        title: Chart-Titel
+        show_legend: Ob Legende angezeigt werden soll
+
+    Returns:
+        Layout-Dictionary
+    """
+    return dict(_cached_base_layout(title, show_legend))
+
+
 def create_donut_chart(
     df: pd.DataFrame,
     values_col: str,
@@ -79,23 +207,29 @@ def create_donut_chart(
     """
     fig = go.Figure()
 
+    # Prozentwerte einmal in Python berechnen statt im Browser
+    labels = df[names_col].to_numpy()
+    values = _to_plot_dtype(df[values_col])
+    total = float(values.sum())
+    percents = values / total * 100 if total else np.zeros(len(values))
+    text = [f"{label}<br>{pct:.1f}%" for label, pct in zip(labels, percents)]
+
     fig.add_trace(go.Pie(
-        labels=df[names_col],
-        values=df[values_col],
+        labels=labels,
+        values=values,
+        text=text,
         hole=0.4,
         marker=dict(
             colors=colors if colors else COLOR_SEQUENCE,
-            line=dict(color=COLORS["background"], width=2)
+            line=dict(color=_BG, width=2)
         ),
-        textinfo="label+percent",
+        textinfo="text",
         textposition="auto",
         hovertemplate="<b>%{label}</b><br>%{value:,.0f}<br>%{percent}<extra></extra>",
         showlegend=False
     ))
 
-    layout = get_base_layout(title, show_legend=False)
-    layout["height"] = height
-    fig.update_layout(**layout)
+    fig.update_layout(**get_base_layout(title, False), height=height)
 
     return fig
 
@@ -128,38 +262,36 @@ def create_bar_chart(
 
     if color_col and color_col in df.columns:
         # Gruppierte Bars
-        for i, category in enumerate(df[color_col].unique()):
-            cat_data = df[df[color_col] == category]
+        groups = df.groupby(color_col, sort=False, observed=True)
+        palette = _colors_for(groups.ngroups)
+        for i, (category, cat_data) in enumerate(groups):
             fig.add_trace(go.Bar(
-                x=cat_data[x_col] if orientation == "v" else cat_data[y_col],
-                y=cat_data[y_col] if orientation == "v" else cat_data[x_col],
+                x=_to_plot_dtype(cat_data[x_col] if orientation == "v" else cat_data[y_col]),
+                y=_to_plot_dtype(cat_data[y_col] if orientation == "v" else cat_data[x_col]),
                 name=str(category),
                 orientation=orientation,
-                marker_color=COLOR_SEQUENCE[i % len(COLOR_SEQUENCE)],
+                marker_color=palette[i],
                 hovertemplate="<b>%{x}</b><br>%{y:,.2f}<extra></extra>"
             ))
         show_legend = True
     else:
         # Einfache Bars
         fig.add_trace(go.Bar(
-            x=df[x_col] if orientation == "v" else df[y_col],
-            y=df[y_col] if orientation == "v" else df[x_col],
+            x=_to_plot_dtype(df[x_col] if orientation == "v" else df[y_col]),
+            y=_to_plot_dtype(df[y_col] if orientation == "v" else df[x_col]),
             orientation=orientation,
-            marker_color=COLORS["accent_teal"],
+            marker_color=_ACCENT,
             hovertemplate="<b>%{x}</b><br>%{y:,.2f}<extra></extra>",
             showlegend=False
         ))
         show_legend = False
 
-    layout = get_base_layout(title, show_legend=show_legend)
-    layout["height"] = height
-    layout["xaxis"] = {"gridcolor": COLORS["card_border"]}
-    layout["yaxis"] = {"gridcolor": COLORS["card_border"]}
-
-    if orientation == "h":
-        layout["yaxis"]["autorange"] = "reversed"
-
-    fig.update_layout(**layout)
+    fig.update_layout(
+        **get_base_layout(title, show_legend),
+        height=height,
+        xaxis=_AXIS_STYLE,
+        yaxis=_AXIS_REVERSED if orientation == "h" else _AXIS_STYLE
+    )
 
     return fig
 
@@ -170,7 +302,8 @@ def create_line_chart(
     y_col: str,
     title: str = "",
     group_col: Optional[str] = None,
-    height: int = CHART_HEIGHTS["medium"]
+    height: int = CHART_HEIGHTS["medium"],
+    render_mode: str = "auto"
 ) -> go.Figure:
     """
     Erstellt ein Liniendiagramm.
@@ -182,23 +315,30 @@ def create_line_chart(
         title: Chart-Titel
         group_col: Optional Gruppierungsspalte (für mehrere Linien)
         height: Chart-Höhe
+        render_mode: "auto" (WebGL ab WEBGL_MIN_POINTS Punkten), "webgl" oder "svg"
 
     Returns:
         Plotly Figure
     """
     fig = go.Figure()
+    scatter_trace = go.Scattergl if _use_webgl(len(df), render_mode) else go.Scatter
 
     if group_col and group_col in df.columns:
         # Mehrere Linien
-        for i, category in enumerate(df[group_col].unique()):
-            cat_data = df[df[group_col] == category].sort_values(x_col)
-            fig.add_trace(go.Scatter(
+        # Einmal nach (Gruppe, x) vorsortieren statt pro Gruppe zu sortieren;
+        # die Gruppen-Codes erhalten die Reihenfolge des ersten Auftretens
+        group_codes, _ = pd.factorize(df[group_col], sort=False)
+        order = np.lexsort((df[x_col].to_numpy(), group_codes))
+        groups = df.take(order).groupby(group_col, sort=False, observed=True)
+        palette = _colors_for(groups.ngroups)
+        for i, (category, cat_data) in enumerate(groups):
+            fig.add_trace(scatter_trace(
                 x=cat_data[x_col],
-                y=cat_data[y_col],
+                y=_to_plot_dtype(cat_data[y_col]),
                 name=str(category),
                 mode="lines+markers",
                 line=dict(
-                    color=COLOR_SEQUENCE[i % len(COLOR_SEQUENCE)],
+                    color=palette[i],
                     width=2
                 ),
                 marker=dict(size=6),
@@ -207,23 +347,25 @@ def create_line_chart(
         show_legend = True
     else:
         # Einzelne Linie
-        df_sorted = df.sort_values(x_col)
-        fig.add_trace(go.Scatter(
-            x=df_sorted[x_col],
-            y=df_sorted[y_col],
+        x_values = df[x_col].to_numpy()
+        order = np.argsort(x_values, kind="stable")
+        fig.add_trace(scatter_trace(
+            x=x_values[order],
+            y=_to_plot_dtype(df[y_col].to_numpy()[order]),
             mode="lines+markers",
-            line=dict(color=COLORS["accent_teal"], width=3),
+            line=dict(color=_ACCENT, width=3),
             marker=dict(size=6),
             hovertemplate="%{x}<br>%{y:,.2f}<extra></extra>",
             showlegend=False
         ))
         show_legend = False
 
-    layout = get_base_layout(title, show_legend=show_legend)
-    layout["height"] = height
-    layout["xaxis"] = {"gridcolor": COLORS["card_border"]}
-    layout["yaxis"] = {"gridcolor": COLORS["card_border"]}
-    fig.update_layout(**layout)
+    fig.update_layout(
+        **get_base_layout(title, show_legend),
+        height=height,
+        xaxis=_AXIS_STYLE,
+        yaxis=_AXIS_STYLE
+    )
 
     return fig
 
@@ -234,7 +376,8 @@ def create_stacked_area_chart(
     y_col: str,
     group_col: str,
     title: str = "",
-    height: int = CHART_HEIGHTS["medium"]
+    height: int = CHART_HEIGHTS["medium"],
+    render_mode: str = "auto"
 ) -> go.Figure:
     """
     Erstellt ein gestapeltes Flächendiagramm.
@@ -246,6 +389,7 @@ def create_stacked_area_chart(
         group_col: Gruppierungsspalte (für Stapel)
         title: Chart-Titel
         height: Chart-Höhe
+        render_mode: "auto" (WebGL ab WEBGL_MIN_POINTS Punkten), "webgl" oder "svg"
 
     Returns:
         Plotly Figure
@@ -257,29 +401,53 @@ def create_stacked_area_chart(
         index=x_col,
         columns=group_col,
         values=y_col,
-        aggfunc="sum"
+        aggfunc="sum",
+        observed=True
     ).fillna(0)
 
+    # Als zusammenhängende Arrays übergeben (kein pandas-Roundtrip in Plotly)
+    x_values = pivot_df.index.to_numpy()
+    values_mat = np.ascontiguousarray(_to_plot_dtype(pivot_df.to_numpy()))
+
     # Kohorten-spezifische Farben wenn möglich
-    for i, category in enumerate(pivot_df.columns):
-        color = COHORT_COLORS.get(category, COLOR_SEQUENCE[i % len(COLOR_SEQUENCE)])
-
-        fig.add_trace(go.Scatter(
-            x=pivot_df.index,
-            y=pivot_df[category],
-            name=str(category),
-            mode="lines",
-            stackgroup="one",
-            fillcolor=color,
-            line=dict(color=color, width=0),
-            hovertemplate="<b>%{fullData.name}</b><br>%{x}<br>%{y:,.2f}<extra></extra>"
-        ))
+    palette = _colors_for(len(pivot_df.columns))
+    colors = [COHORT_COLORS.get(category, palette[i]) for i, category in enumerate(pivot_df.columns)]
+
+    if _use_webgl(values_mat.size, render_mode):
+        # Scattergl kennt kein stackgroup: Stapel über kumulierte Summen und
+        # fill="tonexty" nachbilden, Einzelwerte für den Hover in customdata
+        stacked = np.cumsum(values_mat, axis=1)
+        for i, (category, color) in enumerate(zip(pivot_df.columns, colors)):
+            fig.add_trace(go.Scattergl(
+                x=x_values,
+                y=stacked[:, i],
+                customdata=values_mat[:, i],
+                name=str(category),
+                mode="lines",
+                fill="tozeroy" if i == 0 else "tonexty",
+                fillcolor=color,
+                line=dict(color=color, width=0),
+                hovertemplate="<b>%{fullData.name}</b><br>%{x}<br>%{customdata:,.2f}<extra></extra>"
+            ))
+    else:
+        for i, (category, color) in enumerate(zip(pivot_df.columns, colors)):
+            fig.add_trace(go.Scatter(
+                x=x_values,
+                y=values_mat[:, i],
+                name=str(category),
+                mode="lines",
+                stackgroup="one",
+                fillcolor=color,
+                line=dict(color=color, width=0),
+                hovertemplate="<b>%{fullData.name}</b><br>%{x}<br>%{y:,.2f}<extra></extra>"
+            ))
 
-    layout = get_base_layout(title)
-    layout["height"] = height
-    layout["xaxis"] = {"gridcolor": COLORS["card_border"]}
-    layout["yaxis"] = {"gridcolor": COLORS["card_border"]}
-    fig.update_layout(**layout)
+    fig.update_layout(
+        **get_base_layout(title, True),
+        height=height,
+        xaxis=_AXIS_STYLE,
+        yaxis=_AXIS_STYLE
+    )
 
     return fig
 
@@ -311,29 +479,31 @@ def create_heatmap(
         index=y_col,
         columns=x_col,
         values=value_col,
-        aggfunc="sum"
+        aggfunc="sum",
+        observed=True
     ).fillna(0)
 
     fig = go.Figure(data=go.Heatmap(
-        z=pivot_df.values,
-        x=pivot_df.columns,
-        y=pivot_df.index,
+        z=np.ascontiguousarray(_to_plot_dtype(pivot_df.to_numpy())),
+        x=pivot_df.columns.to_numpy(),
+        y=pivot_df.index.to_numpy(),
         colorscale="Teal",
         hovertemplate="<b>%{y}</b> × <b>%{x}</b><br>%{z:,.0f}<extra></extra>",
         colorbar=dict(
             title=dict(
                 text="Anzahl",
-                font=dict(color=COLORS["text_primary"])
+                font=dict(color=_TEXT_PRIMARY)
             ),
-            tickfont=dict(color=COLORS["text_primary"])
+            tickfont=dict(color=_TEXT_PRIMARY)
         )
     ))
 
-    layout = get_base_layout(title)
-    layout["height"] = height
-    layout["xaxis"] = {"side": "bottom"}
-    layout["yaxis"] = {"autorange": "reversed"}
-    fig.update_layout(**layout)
+    fig.update_layout(
+        **get_base_layout(title, True),
+        height=height,
+        xaxis=_HEATMAP_XAXIS,
+        yaxis=_HEATMAP_YAXIS
+    )
 
     return fig
 
@@ -362,48 +532,66 @@ def create_population_pyramid(
     """
     fig = go.Figure()
 
-    # Daten nach Geschlecht aufteilen
-    male_data = df[df[gender_col] == "m"].groupby(age_col)[value_col].sum().sort_index()
-    female_data = df[df[gender_col] == "w"].groupby(age_col)[value_col].sum().sort_index()
+    ages = df[age_col]
+    if pd.api.types.is_integer_dtype(ages) and len(df) > 0 and not ages.isna().any():
+        # Ganzzahlige Altersstufen: gewichtetes np.bincount liefert die Summen
+        # pro Alter in einem Durchlauf und bereits sortiert
+        age_values = ages.to_numpy(dtype=np.int64)
+        weights = np.nan_to_num(df[value_col].to_numpy(dtype=np.float64))
+        genders = df[gender_col].to_numpy()
+        min_age = int(age_values.min())
+        n_bins = int(age_values.max()) - min_age + 1
+        age_index = np.arange(min_age, min_age + n_bins)
+
+        mask_m = genders == "m"
+        mask_w = genders == "w"
+        male_values = np.bincount(age_values[mask_m] - min_age, weights=weights[mask_m], minlength=n_bins)
+        female_values = np.bincount(age_values[mask_w] - min_age, weights=weights[mask_w], minlength=n_bins)
+    else:
+        # Daten nach Geschlecht aufteilen (ein groupby-Durchlauf für beide Seiten)
+        pyramid = (
+            df.groupby([age_col, gender_col], observed=True)[value_col].sum()
+            .unstack(gender_col, fill_value=0)
+            .reindex(columns=["m", "w"], fill_value=0)
+            .sort_index()
+        )
+        age_index = pyramid.index.to_numpy()
+        male_values = pyramid["m"].to_numpy()
+        female_values = pyramid["w"].to_numpy()
 
     # Männlich (links, negative Werte)
     fig.add_trace(go.Bar(
-        y=male_data.index,
-        x=-male_data.values,
+        y=age_index,
+        x=-_to_plot_dtype(male_values),
         name="Männlich",
         orientation="h",
-        marker_color=COLORS["gender_male"],
+        marker_color=_MALE,
         hovertemplate="<b>Männlich</b><br>Alter: %{y}<br>Anzahl: %{x:,.0f}<extra></extra>"
     ))
 
     # Weiblich (rechts, positive Werte)
     fig.add_trace(go.Bar(
-        y=female_data.index,
-        x=female_data.values,
+        y=age_index,
+        x=_to_plot_dtype(female_values),
         name="Weiblich",
         orientation="h",
-        marker_color=COLORS["gender_female"],
+        marker_color=_FEMALE,
         hovertemplate="<b>Weiblich</b><br>Alter: %{y}<br>Anzahl: %{x:,.0f}<extra></extra>"
     ))
 
-    layout = get_base_layout(title)
-    layout["height"] = height
-    layout["barmode"] = "overlay"
-    layout["bargap"] = 0.1
-    layout["xaxis"] = {
-        "title": "Anzahl",
-        "gridcolor": COLORS["card_border"]
-    }
-    layout["yaxis"] = {
-        "title": "Alter",
-        "gridcolor": COLORS["card_border"]
-    }
-
-    fig.update_layout(**layout)
+    fig.update_layout(
+        **get_base_layout(title, True),
+        height=height,
+        barmode="overlay",
+        bargap=0.1,
+        xaxis=_PYRAMID_XAXIS,
+        yaxis=_PYRAMID_YAXIS
+    )
 
     return fig
 
 
+@_cache_chart
 def create_gauge_chart(
     value: float,
     title: str = "",
@@ -429,41 +617,42 @@ def create_gauge_chart(
 
     # Farbe basierend auf Schwellenwerten
     if value >= thresholds["good"]:
-        gauge_color = COLORS["status_good"]
+        gauge_color = _GOOD
     elif value >= thresholds["warning"]:
-        gauge_color = COLORS["status_warning"]
+        gauge_color = _WARN
     else:
-        gauge_color = COLORS["status_critical"]
+        gauge_color = _CRIT
 
     fig = go.Figure(go.Indicator(
         mode="gauge+number+delta",
         value=value * 100,  # Als Prozent
         domain={"x": [0, 1], "y": [0, 1]},
-        title={"text": title, "font": {"color": COLORS["text_primary"]}},
+        title={"text": title, "font": {"color": _TEXT_PRIMARY}},
         number={"suffix": "%", "font": {"size": 40}},
         gauge={
-            "axis": {"range": [None, max_value * 100], "tickwidth": 1, "tickcolor": COLORS["text_secondary"]},
+            "axis": {"range": [None, max_value * 100], "tickwidth": 1, "tickcolor": _TEXT_SECONDARY},
             "bar": {"color": gauge_color},
-            "bgcolor": COLORS["card_bg"],
+            "bgcolor": _CARD_BG,
             "borderwidth": 2,
-            "bordercolor": COLORS["card_border"],
+            "bordercolor": _CARD_BORDER,
             "steps": [
-                {"range": [0, thresholds["warning"] * 100], "color": f"{COLORS['status_critical']}30"},
-                {"range": [thresholds["warning"] * 100, thresholds["good"] * 100], "color": f"{COLORS['status_warning']}30"},
-                {"range": [thresholds["good"] * 100, max_value * 100], "color": f"{COLORS['status_good']}30"}
+                {"range": [0, thresholds["warning"] * 100], "color": f"{_CRIT}30"},
+                {"range": [thresholds["warning"] * 100, thresholds["good"] * 100], "color": f"{_WARN}30"},
+                {"range": [thresholds["good"] * 100, max_value * 100], "color": f"{_GOOD}30"}
             ]
         }
     ))
 
     fig.update_layout(
         paper_bgcolor="rgba(0,0,0,0)",
-        font={"color": COLORS["text_primary"]},
+        font={"color": _TEXT_PRIMARY},
         height=height
     )
 
     return fig
 
 
+@_cache_chart
 def create_funnel_chart(
     stages: List[str],
     values: List[float],
@@ -482,22 +671,26 @@ def create_funnel_chart(
     Returns:
         Plotly Figure
     """
+    # Anteil an der ersten Stufe einmal vorberechnen
+    stage_values = np.asarray(values, dtype=np.float64)
+    initial = stage_values[0] if len(stage_values) else 0
+    percent_initial = stage_values / initial if initial else np.zeros(len(stage_values))
+    text = [f"{value:,.0f}<br>{pct:.0%}" for value, pct in zip(stage_values, percent_initial)]
+
     fig = go.Figure(go.Funnel(
         y=stages,
-        x=values,
+        x=_to_plot_dtype(stage_values),
+        text=text,
         textposition="inside",
-        textinfo="value+percent initial",
+        textinfo="text",
         marker=dict(
-            color=COLOR_SEQUENCE[:len(stages)],
-            line=dict(color=COLORS["background"], width=2)
+            color=_colors_for(len(stages)),
+            line=dict(color=_BG, width=2)
         ),
         hovertemplate="<b>%{y}</b><br>%{x:,.0f}<br>%{percentInitial}<extra></extra>"
     ))
 
-    layout = get_base_layout(title)
-    layout["height"] = height
-    layout["showlegend"] = False
-    fig.update_layout(**layout)
+    fig.update_layout(**get_base_layout(title, False), height=height)
 
     return fig
 
@@ -528,50 +721,102 @@ def create_gantt_chart(
     """
     fig = go.Figure()
 
-    if color_col and color_col in df.columns:
-        for i, category in enumerate(df[color_col].unique()):
-            cat_data = df[df[color_col] == category]
-            for _, row in cat_data.iterrows():
-                # Konvertiere Start und Ende zu Timestamps
-                start_ts = pd.to_datetime(row[start_col])
-                end_ts = pd.to_datetime(row[end_col])
-
-                fig.add_trace(go.Bar(
-                    x=[end_ts],
-                    y=[row[task_col]],
-                    base=start_ts,
-                    orientation="h",
-                    marker_color=COLOR_SEQUENCE[i % len(COLOR_SEQUENCE)],
-                    name=str(category),
-                    showlegend=False if row.name > cat_data.index[0] else True,
-                    hovertemplate=f"<b>{row[task_col]}</b><br>Start: {row[start_col]}<br>Ende: {row[end_col]}<extra></extra>"
-                ))
-    else:
-        for _, row in df.iterrows():
-            # Konvertiere Start und Ende zu Timestamps
-            start_ts = pd.to_datetime(row[start_col])
-            end_ts = pd.to_datetime(row[end_col])
+    # Start/Ende einmalig konvertieren; Balkenlänge = Dauer in Millisekunden
+    starts = pd.to_datetime(df[start_col]).to_numpy(dtype="datetime64[ns]")
+    ends = pd.to_datetime(df[end_col]).to_numpy(dtype="datetime64[ns]")
+    durations_ms = (ends - starts).astype("timedelta64[ms]").astype(np.int64)
+    tasks = df[task_col].to_numpy()
+    hover_data = np.column_stack((
+        df[start_col].astype(str).to_numpy(),
+        df[end_col].astype(str).to_numpy()
+    ))
+    hovertemplate = "<b>%{y}</b><br>Start: %{customdata[0]}<br>Ende: %{customdata[1]}<extra></extra>"
 
+    if color_col and color_col in df.columns:
+        # Ein Trace pro Farbgruppe statt ein Trace pro Zeile
+        color_values = df[color_col].to_numpy()
+        categories = df[color_col].unique()
+        palette = _colors_for(len(categories))
+        for i, category in enumerate(categories):
+            mask = color_values == category
             fig.add_trace(go.Bar(
-                x=[end_ts],
-                y=[row[task_col]],
-                base=start_ts,
+                x=durations_ms[mask],
+                y=tasks[mask],
+                base=starts[mask],
+                customdata=hover_data[mask],
                 orientation="h",
-                marker_color=COLORS["accent_teal"],
-                showlegend=False,
-                hovertemplate=f"<b>{row[task_col]}</b><br>Start: {row[start_col]}<br>Ende: {row[end_col]}<extra></extra>"
+                marker_color=palette[i],
+                name=str(category),
+                hovertemplate=hovertemplate
             ))
+    else:
+        fig.add_trace(go.Bar(
+            x=durations_ms,
+            y=tasks,
+            base=starts,
+            customdata=hover_data,
+            orientation="h",
+            marker_color=_ACCENT,
+            showlegend=False,
+            hovertemplate=hovertemplate
+        ))
 
-    layout = get_base_layout(title)
-    layout["height"] = height
-    layout["xaxis"] = {"type": "date", "gridcolor": COLORS["card_border"]}
-    layout["yaxis"] = {"autorange": "reversed", "gridcolor": COLORS["card_border"]}
-    layout["barmode"] = "overlay"
-    fig.update_layout(**layout)
+    fig.update_layout(
+        **get_base_layout(title, True),
+        height=height,
+        xaxis=_GANTT_XAXIS,
+        yaxis=_AXIS_REVERSED,
+        barmode="overlay"
+    )
 
     return fig
 
 
+def _build_sunburst_nodes(df: pd.DataFrame, path_cols: List[str], value_col: str):
+    """
+    Baut die flachen ids/labels/parents/values-Vektoren für ein Sunburst-Chart.
+
+    Pro Hierarchie-Ebene wird einmal gruppiert; die ids setzen sich aus dem
+    Pfad bis zur jeweiligen Ebene zusammen ("Bereich/Abteilung/Team"), damit
+    gleichnamige Knoten in verschiedenen Ästen eindeutig bleiben.
+
+    Args:
+        df: DataFrame
+        path_cols: Hierarchie-Spalten (von außen nach innen)
+        value_col: Wertspalte
+
+    Returns:
+        Tuple aus (ids, labels, parents, values) als NumPy-Arrays
+    """
+    leaves = df.groupby(path_cols, sort=False, observed=True)[value_col].sum().reset_index()
+
+    ids_parts, labels_parts, parents_parts, values_parts = [], [], [], []
+    for depth, col in enumerate(path_cols):
+        level_cols = path_cols[:depth + 1]
+        level = leaves.groupby(level_cols, sort=False, observed=True)[value_col].sum().reset_index()
+
+        labels = level[col].astype(str)
+        if depth == 0:
+            parents = pd.Series("", index=level.index)
+        else:
+            parents = level[path_cols[0]].astype(str)
+            for parent_col in path_cols[1:depth]:
+                parents = parents + "/" + level[parent_col].astype(str)
+        ids = labels if depth == 0 else parents + "/" + labels
+
+        ids_parts.append(ids.to_numpy())
+        labels_parts.append(labels.to_numpy())
+        parents_parts.append(parents.to_numpy())
+        values_parts.append(level[value_col].to_numpy(dtype=np.float64))
+
+    return (
+        np.concatenate(ids_parts),
+        np.concatenate(labels_parts),
+        np.concatenate(parents_parts),
+        np.concatenate(values_parts),
+    )
+
+
 def create_sunburst(
     df: pd.DataFrame,
     path_cols: List[str],
@@ -594,26 +839,28 @@ def create_sunburst(
     Returns:
         Plotly Figure
     """
+    ids, labels, parents, values = _build_sunburst_nodes(df, path_cols, value_col)
+
     fig = go.Figure(go.Sunburst(
-        labels=df[path_cols[-1]] if len(path_cols) == 1 else None,
-        parents=df[path_cols[-2]] if len(path_cols) > 1 else [""] * len(df),
-        values=df[value_col],
+        ids=ids,
+        labels=labels,
+        parents=parents,
+        values=values,
         branchvalues="total",
         marker=dict(
             colorscale="Teal",
             cmid=0.5,
-            line=dict(color=COLORS["background"], width=2)
+            line=dict(color=_BG, width=2)
         ),
         hovertemplate="<b>%{label}</b><br>%{value:,.1f}<br>%{percentParent}<extra></extra>"
     ))
 
-    layout = get_base_layout(title)
-    layout["height"] = height
-    fig.update_layout(**layout)
+    fig.update_layout(**get_base_layout(title, True), height=height)
 
     return fig
 
 
+@_cache_chart
 def create_waterfall(
     categories: List[str],
     values: List[float],
@@ -632,34 +879,34 @@ def create_waterfall(
     Returns:
         Plotly Figure
     """
-    # Bestimme measure types
-    measures = []
-    for i, cat in enumerate(categories):
-        if i == 0:
-            measures.append("absolute")
-        elif i == len(categories) - 1:
-            measures.append("total")
-        else:
-            measures.append("relative")
+    # Bestimme measure types: erster Wert absolut, letzter Summe, Rest relativ
+    measures = ["relative"] * len(categories)
+    if len(measures) > 1:
+        measures[-1] = "total"
+    if measures:
+        measures[0] = "absolute"
+
+    value_arr = np.asarray(values, dtype=np.float64)
 
     fig = go.Figure(go.Waterfall(
         x=categories,
-        y=values,
+        y=_to_plot_dtype(value_arr),
         measure=measures,
-        text=[f"{v:+.1f}" if v != 0 else "" for v in values],
+        text=np.where(value_arr != 0, _format_signed(value_arr), ""),
         textposition="outside",
-        connector=dict(line=dict(color=COLORS["card_border"], width=2)),
-        increasing=dict(marker=dict(color=COLORS["status_good"])),
-        decreasing=dict(marker=dict(color=COLORS["status_critical"])),
-        totals=dict(marker=dict(color=COLORS["accent_teal"])),
+        connector=dict(line=dict(color=_CARD_BORDER, width=2)),
+        increasing=dict(marker=dict(color=_GOOD)),
+        decreasing=dict(marker=dict(color=_CRIT)),
+        totals=dict(marker=dict(color=_ACCENT)),
         hovertemplate="<b>%{x}</b><br>%{y:,.1f}<extra></extra>"
     ))
 
-    layout = get_base_layout(title)
-    layout["height"] = height
-    layout["xaxis"] = {"gridcolor": COLORS["card_border"]}
-    layout["yaxis"] = {"gridcolor": COLORS["card_border"], "title": "FTE"}
-    fig.update_layout(**layout)
+    fig.update_layout(
+        **get_base_layout(title, True),
+        height=height,
+        xaxis=_AXIS_STYLE,
+        yaxis=_WATERFALL_YAXIS
+    )
 
     return fig
 
@@ -690,30 +937,24 @@ def create_diverging_bar(
     df_sorted = df.sort_values(value_col)
 
     # Farben basierend auf pos/neg
-    colors = [COLORS["status_good"] if v >= 0 else COLORS["status_critical"]
+    colors = [_GOOD if v >= 0 else _CRIT
               for v in df_sorted[value_col]]
 
     fig.add_trace(go.Bar(
         y=df_sorted[category_col],
-        x=df_sorted[value_col],
+        x=_to_plot_dtype(df_sorted[value_col]),
         orientation="h",
         marker=dict(color=colors),
-        text=df_sorted[value_col].apply(lambda x: f"{x:+.1f}"),
+        text=_format_signed(df_sorted[value_col]),
         textposition="outside",
         hovertemplate="<b>%{y}</b><br>Varianz: %{x:+.1f}<extra></extra>"
     ))
 
-    layout = get_base_layout(title)
-    layout["height"] = height
-    layout["xaxis"] = {
-        "gridcolor": COLORS["card_border"],
-        "title": "Varianz (FTE)",
-        "zeroline": True,
-        "zerolinecolor": COLORS["text_secondary"],
-        "zerolinewidth": 2
-    }
-    layout["yaxis"] = {"gridcolor": COLORS["card_border"], "autorange": "reversed"}
-    layout["showlegend"] = False
-    fig.update_layout(**layout)
+    fig.update_layout(
+        **get_base_layout(title, False),
+        height=height,
+        xaxis=_DIVERGING_XAXIS,
+        yaxis=_AXIS_REVERSED
+    )
 
     return fig
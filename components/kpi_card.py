@@ -6,14 +6,40 @@ Styled KPI-Karten mit Wert, Trend und optionalem Sparkline.
 
 import streamlit as st
 from typing import Optional, List, Tuple
-import sys
-import os
 
-# Import settings
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.settings import COLORS
 
 
+# Rahmenfarbe je Status (sonst neutraler Kartenrand)
+_STATUS_BORDER_COLORS = {
+    "good": COLORS["status_good"],
+    "warning": COLORS["status_warning"],
+    "critical": COLORS["status_critical"],
+}
+
+# HTML-Gerüst der KPI-Card; Theme-Farben werden einmalig beim Import eingesetzt
+_CARD_TEMPLATE = f"""
+        <div style="
+        background: {COLORS["card_bg"]};
+        border-left: 4px solid {{border_color}};
+        padding: 1.5rem;
+        border-radius: 8px;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        height: 100%;
+    ">
+            <div style="color: {COLORS["text_secondary"]}; font-size: 0.85rem; font-weight: 500; text-transform: uppercase; letter-spacing: 0.5px; margin-bottom: 0.5rem;">
+                {{icon}} {{title}}
+            </div>
+            <div style="color: {COLORS["text_primary"]}; font-size: 2rem; font-weight: 700; margin: 0.5rem 0;">
+                {{value}}
+            </div>
+            <div style="color: {COLORS["text_secondary"]}; font-size: 0.85rem;">
+                {{subtitle}}
+            </div>
+        </div>
+        """
+
+
 def kpi_card(
     title: str,
     value: str,
@@ -35,45 +61,17 @@ def kpi_card(
         status: Optional "good", "warning", "critical" für Farbkodierung
         icon: Optional Emoji/Icon
     """
-    # Status-Farbe bestimmen
-    if status == "good":
-        border_color = COLORS["status_good"]
-        bg_color = COLORS["card_bg"]
-    elif status == "warning":
-        border_color = COLORS["status_warning"]
-        bg_color = COLORS["card_bg"]
-    elif status == "critical":
-        border_color = COLORS["status_critical"]
-        bg_color = COLORS["card_bg"]
-    else:
-        border_color = COLORS["card_border"]
-        bg_color = COLORS["card_bg"]
-
-    # CSS für Container
-    container_style = f"""
-        background: {bg_color};
-        border-left: 4px solid {border_color};
-        padding: 1.5rem;
-        border-radius: 8px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        height: 100%;
-    """
+    border_color = _STATUS_BORDER_COLORS.get(status, COLORS["card_border"])
 
     # Verwende Streamlit Container statt rohem HTML
     with st.container():
-        st.markdown(f"""
-        <div style="{container_style}">
-            <div style="color: {COLORS["text_secondary"]}; font-size: 0.85rem; font-weight: 500; text-transform: uppercase; letter-spacing: 0.5px; margin-bottom: 0.5rem;">
-                {icon} {title}
-            </div>
-            <div style="color: {COLORS["text_primary"]}; font-size: 2rem; font-weight: 700; margin: 0.5rem 0;">
-                {value}
-            </div>
-            <div style="color: {COLORS["text_secondary"]}; font-size: 0.85rem;">
-                {subtitle}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_CARD_TEMPLATE.format(
+            border_color=border_color,
+            icon=icon,
+            title=title,
+            value=value,
+            subtitle=subtitle
+        ), unsafe_allow_html=True)
 
         # Trend separat als Streamlit Metric
         if trend:
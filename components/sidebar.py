@@ -6,13 +6,38 @@ Rendert alle Filter und wendet sie auf den DataFrame an.
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime
-import sys
-import os
 
-# Import settings
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config.settings import DEFAULT_COHORTS, COLORS
+from config.settings import DEFAULT_COHORTS, COLORS, SESSION_STATE_DEFAULTS, ATZ_STATUS_CATEGORIES
+
+
+# Session-State-Key -> gefilterte Spalte (Reihenfolge wie in der Sidebar)
+_FILTER_COLUMNS = (
+    ("selected_org_units", "Kürzel OrgEinheit"),
+    ("selected_cohorts", "Alterskohorte"),
+    ("selected_genders", "Geschlecht"),
+    ("selected_employment", "Arbeitszeit"),
+    ("selected_education", "Ausbildung"),
+    ("selected_atz_status", "ATZ_Status"),
+)
+
+# Vollständige Wertebereiche der Filter mit festen Optionen
+_FILTER_UNIVERSES = {
+    "selected_genders": frozenset({"m", "w"}),
+    "selected_employment": frozenset({"Vollzeit", "Teilzeit"}),
+    "selected_atz_status": frozenset(ATZ_STATUS_CATEGORIES),
+}
+
+# Bezeichnungen aktiver Filter in der Filter-Zusammenfassung ({n} = Anzahl Auswahl)
+_FILTER_SUMMARY_LABELS = {
+    "selected_org_units": "{n} Org-Einheiten",
+    "selected_cohorts": "{n} Kohorten",
+    "selected_genders": "Geschlecht",
+    "selected_employment": "Arbeitszeit",
+    "selected_education": "Qualifikation",
+    "selected_atz_status": "ATZ-Status",
+}
 
 
 def render_global_filters(snapshot_df: pd.DataFrame, history_df: pd.DataFrame):
@@ -24,29 +49,8 @@ def render_global_filters(snapshot_df: pd.DataFrame, history_df: pd.DataFrame):
         history_df: History DataFrame (für Datumsbereich)
     """
     # Initialize session state defaults BEFORE rendering
-    if "cohort_definitions" not in st.session_state:
-        st.session_state["cohort_definitions"] = DEFAULT_COHORTS.copy()
-
-    if "selected_org_units" not in st.session_state:
-        st.session_state["selected_org_units"] = []
-
-    if "selected_cohorts" not in st.session_state:
-        st.session_state["selected_cohorts"] = []
-
-    if "selected_genders" not in st.session_state:
-        st.session_state["selected_genders"] = ["m", "w"]
-
-    if "selected_employment" not in st.session_state:
-        st.session_state["selected_employment"] = ["Vollzeit", "Teilzeit"]
-
-    if "selected_education" not in st.session_state:
-        st.session_state["selected_education"] = []
-
-    if "selected_atz_status" not in st.session_state:
-        st.session_state["selected_atz_status"] = ["Kein ATZ", "Arbeitsphase", "Freistellungsphase"]
-
-    if "view_mode" not in st.session_state:
-        st.session_state["view_mode"] = "MAK"
+    for key, default in SESSION_STATE_DEFAULTS.items():
+        st.session_state.setdefault(key, default.copy() if hasattr(default, "copy") else default)
 
     with st.sidebar:
         # MAK/EUR Toggle ganz oben
@@ -65,7 +69,7 @@ def render_global_filters(snapshot_df: pd.DataFrame, history_df: pd.DataFrame):
 
         st.header("🎯 Filter")
 
-        # Datumsbereich (aus History)
+        # Datumsbereich (aus History; min/max direkt ist günstiger als ein Cache-Hash)
         if not history_df.empty:
             min_date = history_df["Date"].min().date()
             max_date = history_df["Date"].max().date()
@@ -80,22 +84,16 @@ def render_global_filters(snapshot_df: pd.DataFrame, history_df: pd.DataFrame):
                 label_visibility="collapsed"
             )
 
-            # Update session state
-            if isinstance(date_range, tuple) and len(date_range) == 2:
-                st.session_state["date_range"] = date_range
-            else:
-                st.session_state["date_range"] = (min_date, max_date)
+            # Update session state (unvollständige Auswahl -> gesamter Zeitraum)
+            complete = isinstance(date_range, tuple) and len(date_range) == 2
+            st.session_state["date_range"] = date_range if complete else (min_date, max_date)
 
         st.divider()
 
         # Organisationseinheiten
         st.subheader("🏢 Organisationseinheiten")
-        org_units = sorted(snapshot_df["Kürzel OrgEinheit"].dropna().unique())
-        org_unit_names = snapshot_df[["Kürzel OrgEinheit", "Organisationseinheit"]].drop_duplicates()
-        org_unit_options = {
-            row["Kürzel OrgEinheit"]: f"{row['Kürzel OrgEinheit']} - {row['Organisationseinheit']}"
-            for _, row in org_unit_names.iterrows()
-        }
+        org_units = _sorted_options(snapshot_df["Kürzel OrgEinheit"])
+        org_unit_options = {k: f"{k} - {name}" for k, name in _org_unit_names(snapshot_df).items()}
 
         selected_orgs = st.multiselect(
             "Einheiten auswählen",
@@ -158,7 +156,7 @@ def render_global_filters(snapshot_df: pd.DataFrame, history_df: pd.DataFrame):
 
         # Qualifikation
         st.subheader("🎓 Qualifikation")
-        education_options = sorted(snapshot_df["Ausbildung"].dropna().unique())
+        education_options = _sorted_options(snapshot_df["Ausbildung"])
         selected_education = st.multiselect(
             "Qualifikation auswählen",
             options=education_options,
@@ -189,6 +187,44 @@ def render_global_filters(snapshot_df: pd.DataFrame, history_df: pd.DataFrame):
             st.rerun()
 
 
+def _sorted_options(series: pd.Series) -> list:
+    """
+    Sortierte, eindeutige Auswahloptionen einer Spalte (ohne NaN).
+
+    Bei category-Spalten sind das direkt die (bereits sortierten) Kategorien.
+
+    Args:
+        series: Spalte des Snapshots
+
+    Returns:
+        Liste der Optionen
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.categories.tolist()
+    return sorted(series.dropna().unique())
+
+
+def _org_unit_names(snapshot_df: pd.DataFrame) -> dict:
+    """
+    Org-Einheiten (Kürzel -> Name) für die Auswahl-Texte.
+
+    Nimmt je Kürzel die letzte Zeile (wie dict(zip(...)) über alle Zeilen),
+    ohne Python-Schleife über den Snapshot; Schlüssel als Python-Typen.
+
+    Args:
+        snapshot_df: Snapshot DataFrame
+
+    Returns:
+        Dictionary Kürzel -> Name der Organisationseinheit
+    """
+    kuerzel = snapshot_df["Kürzel OrgEinheit"]
+    last = ~kuerzel.duplicated(keep="last").to_numpy()
+    return dict(zip(
+        kuerzel[last].tolist(),
+        snapshot_df["Organisationseinheit"][last].tolist()
+    ))
+
+
 def render_cohort_editor():
     """
     Editor für Alterskohorten-Definitionen.
@@ -237,55 +273,88 @@ def apply_filters(df: pd.DataFrame) -> pd.DataFrame:
     """
     Wendet alle aktiven Filter auf den DataFrame an.
 
+    Der Filterzustand wird einmal aus dem Session State gelesen und als
+    kanonisches Tuple an die Filterfunktion übergeben. Bewusst ungecacht:
+    st.cache_data müsste den Snapshot bei jedem Rerun inhaltlich hashen,
+    was ein Vielfaches der Maskenbildung kostet; ein id()-Key trifft nie,
+    da der Loader pro Rerun neue Kopien liefert.
+
     Args:
         df: Snapshot DataFrame
 
     Returns:
         Gefilterter DataFrame
     """
-    filtered = df.copy()
+    filters = []
+    for state_key, column in _FILTER_COLUMNS:
+        selected = tuple(sorted(st.session_state.get(state_key) or []))
+        universe = _FILTER_UNIVERSES.get(state_key)
+        selects_all = universe is not None and universe.issubset(selected)
+        filters.append((column, selected, selects_all))
+    return _filter_snapshot(df, tuple(filters))
+
+
+def _filter_snapshot(df: pd.DataFrame, filters: tuple) -> pd.DataFrame:
+    """
+    Filtert den Snapshot anhand eines kanonischen Filterzustands.
+
+    Args:
+        df: Snapshot DataFrame
+        filters: Tuple aus (Spalte, ausgewählte Werte, Auswahl umfasst alle
+            Werte); leere Auswahl = kein Filter
+
+    Returns:
+        Gefilterter DataFrame
+    """
+    # Filter, die alle Werte auswählen, wirken nur noch auf fehlende Werte
+    # (z.B. Geschlecht bei Vakanzen) - ohne NaN in der Spalte entfallen sie
+    active = [
+        (column, selected)
+        for column, selected, selects_all in filters
+        if selected and not (selects_all and not df[column].hasnans)
+    ]
+
+    # Ohne aktive Filter den Snapshot unverändert zurückgeben (kein Slice)
+    if not active:
+        return df
+
+    # Alle Filter in-place zu einer Maske kombinieren und erst am Ende einmal
+    # slicen; die erste Filtermaske dient als Start (kopiert nur, falls read-only)
+    (first_column, first_selected), *other_filters = active
+    mask = np.require(_isin_mask(df[first_column], first_selected), requirements="W")
 
     # Nur besetzte Stellen (Vakanten rausfiltern für Mitarbeiter-Analysen)
     # WICHTIG: Für Planstellen-Analysen muss dies optional sein
-    # filtered = filtered[~filtered["Is_Vacant"]]
-
-    # Organisationseinheiten
-    if st.session_state.get("selected_org_units"):
-        filtered = filtered[
-            filtered["Kürzel OrgEinheit"].isin(st.session_state["selected_org_units"])
-        ]
-
-    # Alterskohorten
-    if st.session_state.get("selected_cohorts"):
-        filtered = filtered[
-            filtered["Alterskohorte"].isin(st.session_state["selected_cohorts"])
-        ]
-
-    # Geschlecht
-    if st.session_state.get("selected_genders"):
-        filtered = filtered[
-            filtered["Geschlecht"].isin(st.session_state["selected_genders"])
-        ]
-
-    # Arbeitszeit
-    if st.session_state.get("selected_employment"):
-        filtered = filtered[
-            filtered["Arbeitszeit"].isin(st.session_state["selected_employment"])
-        ]
-
-    # Qualifikation
-    if st.session_state.get("selected_education"):
-        filtered = filtered[
-            filtered["Ausbildung"].isin(st.session_state["selected_education"])
-        ]
-
-    # ATZ-Status
-    if st.session_state.get("selected_atz_status"):
-        filtered = filtered[
-            filtered["ATZ_Status"].isin(st.session_state["selected_atz_status"])
-        ]
-
-    return filtered
+    # mask &= ~df["Is_Vacant"].to_numpy()
+
+    for column, selected in other_filters:
+        np.logical_and(mask, _isin_mask(df[column], selected), out=mask)
+
+    return df.loc[mask]
+
+
+def _isin_mask(series: pd.Series, selected: tuple) -> np.ndarray:
+    """
+    Boolesche Maske "Wert in Auswahl" für eine Spalte.
+
+    Bei category-Spalten wird statt isin eine Lookup-Tabelle über die
+    Kategorien gebaut und per Code indiziert (Code -1/NaN -> Slot 0 = False).
+
+    Args:
+        series: Zu filternde Spalte
+        selected: Ausgewählte Werte
+
+    Returns:
+        Boolesches NumPy-Array
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.isin(selected).to_numpy()
+
+    categories = series.cat.categories
+    positions = categories.get_indexer(pd.Index(selected).unique())
+    lookup = np.zeros(len(categories) + 1, dtype=bool)
+    lookup[positions[positions >= 0] + 1] = True
+    return lookup[series.cat.codes.to_numpy() + 1]
 
 
 def reset_filters():
@@ -308,23 +377,14 @@ def get_filter_summary() -> str:
     """
     active_filters = []
 
-    if st.session_state.get("selected_org_units"):
-        active_filters.append(f"{len(st.session_state['selected_org_units'])} Org-Einheiten")
-
-    if st.session_state.get("selected_cohorts"):
-        active_filters.append(f"{len(st.session_state['selected_cohorts'])} Kohorten")
-
-    if len(st.session_state.get("selected_genders", [])) < 2:
-        active_filters.append("Geschlecht")
-
-    if len(st.session_state.get("selected_employment", [])) < 2:
-        active_filters.append("Arbeitszeit")
-
-    if st.session_state.get("selected_education"):
-        active_filters.append("Qualifikation")
-
-    if len(st.session_state.get("selected_atz_status", [])) < 3:
-        active_filters.append("ATZ-Status")
+    for state_key, _ in _FILTER_COLUMNS:
+        selected = st.session_state.get(state_key, [])
+        universe = _FILTER_UNIVERSES.get(state_key)
+        # Filter mit festem Wertebereich sind aktiv, sobald nicht alles gewählt ist;
+        # die übrigen, sobald überhaupt eine Auswahl besteht
+        is_active = not universe.issubset(selected) if universe is not None else bool(selected)
+        if is_active:
+            active_filters.append(_FILTER_SUMMARY_LABELS[state_key].format(n=len(selected)))
 
     if active_filters:
         return f"🎯 {len(active_filters)} Filter aktiv: " + ", ".join(active_filters)
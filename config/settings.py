@@ -76,6 +76,23 @@ DEFAULT_COHORTS: Dict[str, Tuple[int, int]] = {
     "Retirement Ready": (63, 99),
 }
 
+# =============================================================================
+# SESSION STATE DEFAULTS
+# =============================================================================
+
+# Startwerte für st.session_state (Filter, Ansicht, Kohorten)
+SESSION_STATE_DEFAULTS = {
+    "cohort_definitions": DEFAULT_COHORTS,
+    "view_mode": "MAK",
+    "selected_genders": ["m", "w"],
+    "selected_employment": ["Vollzeit", "Teilzeit"],
+    "selected_atz_status": ["Kein ATZ", "Arbeitsphase", "Freistellungsphase"],
+    "selected_org_units": [],
+    "selected_cohorts": [],
+    "selected_education": [],
+    "date_range": None,
+}
+
 # =============================================================================
 # TARIFSTRUKTUR
 # =============================================================================
@@ -123,6 +140,9 @@ EMPLOYMENT_TYPES = ["Unbefristet", "Zeitvertrag", "Altersteilzeit", "Auszubilden
 
 ATZ_PHASES = ["Arbeitsphase", "Freistellungsphase"]
 
+# Ausprägungen der abgeleiteten Spalte ATZ_Status (Reihenfolge = Kategorienreihenfolge)
+ATZ_STATUS_CATEGORIES = ["Kein ATZ"] + ATZ_PHASES
+
 STATUS_TYPES = ["Aktives Beschäftigungsverhältnis", "Ruhendes Beschäftigungsverhältnis"]
 
 # =============================================================================
@@ -261,11 +281,14 @@ JOBFAMILIES_CONFIG_PATH = "config/jobfamilies.json"
 # FORMATIERUNG
 # =============================================================================
 
+# Tausender- und Dezimaltrennzeichen in einem Durchlauf tauschen (1,234.5 -> 1.234,5)
+_DE_NUMBER_TRANSLATION = str.maketrans({",": ".", ".": ","})
+
 def format_number(value: float, decimals: int = 0) -> str:
     """Formatiert Zahlen mit Tausender-Punkt (deutsch)"""
     if decimals == 0:
         return f"{value:,.0f}".replace(",", ".")
-    return f"{value:,.{decimals}f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    return f"{value:,.{decimals}f}".translate(_DE_NUMBER_TRANSLATION)
 
 def format_currency(value: float, suffix: str = "€") -> str:
     """Formatiert Währungsbeträge"""
@@ -277,7 +300,7 @@ def format_currency(value: float, suffix: str = "€") -> str:
 
 def format_percent(value: float, decimals: int = 1) -> str:
     """Formatiert Prozentwerte"""
-    return f"{value * 100:,.{decimals}f}%".replace(",", "X").replace(".", ",").replace("X", ".")
+    return f"{value * 100:,.{decimals}f}%".translate(_DE_NUMBER_TRANSLATION)
 
 def get_status_color(value: float, metric: str) -> str:
     """Ermittelt Status-Farbe basierend auf Schwellenwerten"""
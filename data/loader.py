@@ -4,15 +4,42 @@ Daten-Loader für HR Pulse Dashboard.
 Lädt und cached HR-Daten aus Excel mit Streamlit.
 """
 
+import numpy as np
 import pandas as pd
 import streamlit as st
+from functools import lru_cache
 from typing import Dict, Tuple
 import sys
 import os
 
 # Import settings
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config.settings import DATA_PATH, DEFAULT_COHORTS
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+from config.settings import DATA_PATH, DEFAULT_COHORTS, ATZ_STATUS_CATEGORIES, FULLTIME_THRESHOLD
+
+# Textspalten des Snapshots, die als category geladen werden (Filter, groupby)
+SNAPSHOT_CATEGORICAL_COLUMNS = [
+    "Kürzel OrgEinheit",
+    "Organisationseinheit",
+    "Ausbildung",
+    "Vertragsart",
+    "Text Gsch",
+]
+
+# FTE-Spalten, die verlustfrei als float32 gehalten werden können (Kosten bleiben
+# float64: Summen im Millionenbereich wären in float32 ungenau)
+SNAPSHOT_FLOAT32_COLUMNS = ["FTE_person", "FTE_assigned"]
+
+# Parquet-Kopien der Excel-Sheets (liegen neben der Excel-Datei)
+_PARQUET_FILES = {
+    "snapshot_detail": "snapshot.parquet",
+    "history_cube": "history.parquet",
+    "org_structure": "org.parquet",
+}
+
+_NS_PER_DAY = 86_400 * 10**9
+_NAT_INT = np.iinfo(np.int64).min
 
 
 @st.cache_data
@@ -20,6 +47,9 @@ def load_hr_data(filepath: str = None, auto_generate: bool = True) -> Dict[str,
     """
     Lädt HR-Daten aus Excel-Datei.
 
+    Die Sheets werden beim ersten Laden als Parquet neben der Excel-Datei
+    abgelegt und danach von dort gelesen, solange die Excel-Datei nicht neuer ist.
+
     Wenn die Datei nicht existiert und auto_generate=True, werden automatisch
     synthetische Testdaten generiert.
 
@@ -65,29 +95,10 @@ def load_hr_data(filepath: str = None, auto_generate: bool = True) -> Dict[str,
                 f"Bitte zuerst Testdaten generieren mit: python data/synthetic.py"
             )
 
-    # Lade alle Sheets
-    data = {}
-
+    # Lade alle Sheets (aus dem Parquet-Cache, falls aktuell)
     try:
-        # Snapshot Detail
-        data["snapshot_detail"] = pd.read_excel(
-            filepath,
-            sheet_name="snapshot_detail",
-            parse_dates=["GebDatum", "Eintritt", "Austritt"]
-        )
-
-        # History Cube
-        data["history_cube"] = pd.read_excel(
-            filepath,
-            sheet_name="history_cube",
-            parse_dates=["Date"]
-        )
-
-        # Org Structure
-        data["org_structure"] = pd.read_excel(
-            filepath,
-            sheet_name="org_structure"
-        )
+        data = _load_sheets(filepath)
+        _categoricalize(data["snapshot_detail"], SNAPSHOT_CATEGORICAL_COLUMNS)
 
     except Exception as e:
         raise Exception(f"Fehler beim Laden der Daten: {str(e)}")
@@ -108,24 +119,11 @@ def enrich_snapshot_data(df: pd.DataFrame) -> pd.DataFrame:
     """
     df = df.copy()
 
-    # Alter berechnen (zum aktuellen Datum)
+    # Alter und Betriebszugehörigkeit in Jahren (zum aktuellen Datum)
     today = pd.Timestamp.today()
-    df["Alter"] = (today - df["GebDatum"]).dt.days / 365.25
-    df["Alter"] = df["Alter"].fillna(0).astype(int)
-
-    # Betriebszugehörigkeit in Jahren
-    df["Betriebszugehörigkeit_Jahre"] = (today - df["Eintritt"]).dt.days / 365.25
-    df["Betriebszugehörigkeit_Jahre"] = df["Betriebszugehörigkeit_Jahre"].fillna(0)
-
-    # Alterskohorten (aus session_state, falls verfügbar)
-    if "cohort_definitions" in st.session_state:
-        cohorts = st.session_state["cohort_definitions"]
-    else:
-        cohorts = DEFAULT_COHORTS
-
-    df["Alterskohorte"] = df["Alter"].apply(
-        lambda age: assign_age_cohort(age, cohorts)
-    )
+    # int8 reicht für Lebensalter; fehlende Geburtsdaten ergeben 0
+    df["Alter"] = np.clip(_years_since(df["GebDatum"], today), 0, 127).astype(np.int8)
+    df["Betriebszugehörigkeit_Jahre"] = _years_since(df["Eintritt"], today)
 
     # Geschlecht vereinfachen
     df["Geschlecht"] = df["Text Gsch"].map({
@@ -134,25 +132,49 @@ def enrich_snapshot_data(df: pd.DataFrame) -> pd.DataFrame:
     })
 
     # Vollzeit/Teilzeit
-    df["Arbeitszeit"] = df["FTE_person"].apply(
-        lambda x: "Vollzeit" if x >= 0.95 else "Teilzeit"
+    df["Arbeitszeit"] = pd.Categorical(
+        np.where(df["FTE_person"].to_numpy() >= FULLTIME_THRESHOLD, "Vollzeit", "Teilzeit")
     )
 
-    # ATZ-Status
-    def get_atz_status(row):
-        if pd.isna(row["Vertragsart"]) or row["Vertragsart"] != "Altersteilzeit":
-            return "Kein ATZ"
-        # Weitere Logik für Arbeits-/Freistellungsphase könnte hier ergänzt werden
-        # Für jetzt: 50/50 Split basierend auf Alter
-        if row["Alter"] < 60:
-            return "Arbeitsphase"
-        return "Freistellungsphase"
-
-    df["ATZ_Status"] = df.apply(get_atz_status, axis=1)
+    # ATZ-Status (Arbeits-/Freistellungsphase vorerst per Alter: < 60 Arbeitsphase)
+    is_atz = (df["Vertragsart"] == "Altersteilzeit").to_numpy(dtype=bool, na_value=False)
+    arbeitsphase = is_atz & (df["Alter"].to_numpy() < 60)
+    freistellung = is_atz & ~arbeitsphase
+    df["ATZ_Status"] = pd.Categorical(
+        np.select(
+            [freistellung, arbeitsphase],
+            ["Freistellungsphase", "Arbeitsphase"],
+            default="Kein ATZ"
+        ),
+        categories=ATZ_STATUS_CATEGORIES
+    )
 
     # Ist-Soll Abweichung
     df["Abweichung_FTE"] = df["Soll_FTE"] - df["FTE_assigned"]
 
+    # FTE-Spalten halbieren, wenn float32 die Werte exakt darstellt
+    _downcast_lossless(df, SNAPSHOT_FLOAT32_COLUMNS)
+
+    return df
+
+
+def _assign_cohorts(df: pd.DataFrame, cohort_items: Tuple[Tuple[str, Tuple[int, int]], ...]) -> pd.DataFrame:
+    """
+    Ergänzt die Alterskohorte zum angereicherten Snapshot.
+
+    Getrennt von enrich_snapshot_data: Änderungen im Kohorten-Editor berechnen
+    nur diese Spalte neu, nicht die gesamte Anreicherung. Bewusst ungecacht,
+    das Binning ist günstiger als ein inhaltlicher Hash des Snapshots.
+
+    Args:
+        df: Angereicherter Snapshot DataFrame
+        cohort_items: Kohorten-Definitionen als Tuple aus (Name, (Min, Max))
+
+    Returns:
+        DataFrame mit Spalte "Alterskohorte" (category-Dtype)
+    """
+    df = df.copy(deep=False)
+    df["Alterskohorte"] = assign_age_cohorts(df["Alter"].to_numpy(), dict(cohort_items))
     return df
 
 
@@ -173,6 +195,224 @@ def assign_age_cohort(age: int, cohorts: Dict[str, Tuple[int, int]]) -> str:
     return "Unbekannt"
 
 
+def _parquet_paths(xlsx_path: str) -> Dict[str, str]:
+    """
+    Liefert die Pfade der Parquet-Dateien neben der Excel-Datei.
+
+    Args:
+        xlsx_path: Pfad zur Excel-Datei
+
+    Returns:
+        Dictionary Sheet-Name -> Parquet-Pfad
+    """
+    directory = os.path.dirname(xlsx_path)
+    return {
+        sheet: os.path.join(directory, filename)
+        for sheet, filename in _PARQUET_FILES.items()
+    }
+
+
+def _read_excel_sheets(filepath: str) -> Dict[str, pd.DataFrame]:
+    """
+    Liest alle benötigten Sheets aus der Excel-Datei.
+
+    Args:
+        filepath: Pfad zur Excel-Datei
+
+    Returns:
+        Dictionary Sheet-Name -> DataFrame
+    """
+    # Workbook nur einmal öffnen und daraus alle Sheets parsen
+    with pd.ExcelFile(filepath) as workbook:
+        return {
+            # Snapshot Detail
+            "snapshot_detail": workbook.parse(
+                sheet_name="snapshot_detail",
+                parse_dates=["GebDatum", "Eintritt", "Austritt"]
+            ),
+            # History Cube
+            "history_cube": workbook.parse(
+                sheet_name="history_cube",
+                parse_dates=["Date"]
+            ),
+            # Org Structure
+            "org_structure": workbook.parse(
+                sheet_name="org_structure"
+            ),
+        }
+
+
+def _load_sheets(xlsx_path: str) -> Dict[str, pd.DataFrame]:
+    """
+    Lädt die Sheets bevorzugt aus Parquet-Kopien der Excel-Datei.
+
+    Sind die Parquet-Dateien mindestens so neu wie die Excel-Datei, werden
+    sie direkt gelesen. Andernfalls wird die Excel-Datei einmal gelesen und
+    als Parquet abgelegt; ist das Verzeichnis nicht beschreibbar, bleibt es
+    beim Excel-Import. Nicht lesbare (z.B. abgeschnittene) Parquet-Dateien
+    werden wie veraltete behandelt und aus der Excel-Datei neu geschrieben.
+
+    Args:
+        xlsx_path: Pfad zur Excel-Datei
+
+    Returns:
+        Dictionary Sheet-Name -> DataFrame
+    """
+    paths = _parquet_paths(xlsx_path)
+    xlsx_mtime = os.path.getmtime(xlsx_path)
+
+    if all(os.path.exists(p) and os.path.getmtime(p) >= xlsx_mtime for p in paths.values()):
+        try:
+            return {sheet: pd.read_parquet(path) for sheet, path in paths.items()}
+        except (OSError, ValueError, ImportError):
+            # Beschädigte Parquet-Datei: auf den Excel-Import zurückfallen
+            pass
+
+    data = _read_excel_sheets(xlsx_path)
+    for sheet, path in paths.items():
+        # Erst in eine temporäre Datei schreiben und dann atomar ersetzen, damit
+        # ein Abbruch beim Schreiben keine halbe Parquet-Datei hinterlässt
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            data[sheet].to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        except (OSError, ValueError, TypeError, ImportError):
+            # Kein Schreibzugriff, nicht serialisierbare Spalten oder keine Parquet-Engine
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            break
+
+    return data
+
+
+def _categoricalize(df: pd.DataFrame, cols: list) -> None:
+    """
+    Wandelt niedrig-kardinale Textspalten in-place in den category-Dtype um.
+
+    Args:
+        df: DataFrame
+        cols: Spaltennamen (fehlende Spalten werden ignoriert)
+    """
+    for col in cols:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+
+def _downcast_lossless(df: pd.DataFrame, cols: list) -> None:
+    """
+    Wandelt float64-Spalten in-place nach float32, sofern dabei kein Wert verloren geht.
+
+    Werte wie 0.95 sind in float32 nicht exakt darstellbar; Vergleiche mit
+    Schwellenwerten würden kippen, daher bleibt die Spalte dann float64.
+
+    Args:
+        df: DataFrame
+        cols: Spaltennamen (fehlende Spalten werden ignoriert)
+    """
+    for col in cols:
+        if col in df.columns and df[col].dtype == np.float64:
+            values = df[col].to_numpy()
+            downcast = values.astype(np.float32)
+            if np.array_equal(downcast, values, equal_nan=True):
+                df[col] = downcast
+
+
+def _years_since(dates: pd.Series, today: pd.Timestamp) -> np.ndarray:
+    """
+    Berechnet die vergangenen Jahre (volle Tage / 365.25) bis heute.
+
+    Arbeitet direkt auf den int64-Nanosekunden der Datumsspalte; fehlende
+    Daten ergeben 0.
+
+    Args:
+        dates: Datumsspalte
+        today: Stichtag
+
+    Returns:
+        float64-Array mit Jahren
+    """
+    nanos = dates.to_numpy(dtype="datetime64[ns]").view(np.int64)
+    days = (today.as_unit("ns").value - nanos) // _NS_PER_DAY
+    return np.where(nanos == _NAT_INT, 0.0, days / 365.25)
+
+
+@lru_cache(maxsize=32)
+def _cohort_bins(cohort_items: Tuple[Tuple[str, Tuple[int, int]], ...]):
+    """
+    Baut Bin-Kanten und Labels für pd.cut aus den Kohorten-Definitionen.
+
+    Lücken zwischen Kohorten werden als eigene "Unbekannt"-Bins eingefügt.
+    Überlappende oder leere Kohorten (Max < Min) lassen sich nicht binnen.
+
+    Args:
+        cohort_items: Kohorten als Tuple aus (Name, (Min, Max))
+
+    Returns:
+        Tuple aus (Kanten, Labels) oder None, wenn nicht binnbar
+    """
+    items = sorted(cohort_items, key=lambda item: item[1][0])
+    edges = [items[0][1][0]]
+    labels = []
+    for name, (min_age, max_age) in items:
+        if min_age < edges[-1] or max_age < min_age:
+            return None
+        if min_age > edges[-1]:
+            edges.append(min_age)
+            labels.append("Unbekannt")
+        edges.append(max_age + 1)
+        labels.append(name)
+    return edges, labels
+
+
+def assign_age_cohorts(ages: np.ndarray, cohorts: Dict[str, Tuple[int, int]]) -> pd.Categorical:
+    """
+    Ordnet ein Array von Altern vektorisiert den Kohorten zu.
+
+    Entspricht assign_age_cohort für jedes Element (Grenzen inklusive,
+    nicht zugeordnete Alter werden "Unbekannt").
+
+    Args:
+        ages: Alter in Jahren
+        cohorts: Dictionary mit Kohorten-Definitionen
+
+    Returns:
+        Categorical mit Kohorten-Namen (Kategorien in Definitionsreihenfolge,
+        zuletzt "Unbekannt")
+    """
+    categories = [name for name in cohorts if name != "Unbekannt"] + ["Unbekannt"]
+    if not cohorts:
+        return pd.Categorical.from_codes(np.zeros(len(ages), dtype=np.int8), categories=categories)
+
+    bins = _cohort_bins(tuple(cohorts.items()))
+    if bins is None:
+        # Nicht binnbar: erste passende Kohorte gewinnt (wie assign_age_cohort)
+        names = np.select(
+            [(ages >= min_age) & (ages <= max_age) for min_age, max_age in cohorts.values()],
+            list(cohorts.keys()),
+            default="Unbekannt"
+        )
+        return pd.Categorical(names, categories=categories)
+
+    edges, labels = bins
+    bin_index = pd.cut(ages, bins=edges, labels=False, right=False)
+    # Alter außerhalb aller Bins (NaN) zeigen auf das angehängte "Unbekannt"
+    bin_index = np.where(np.isnan(bin_index), len(labels), bin_index).astype(np.intp)
+    # Bin-Index -> Kategorie-Code (Lücken-Bins und Rest auf "Unbekannt")
+    bin_codes = np.array([categories.index(label) for label in labels + ["Unbekannt"]], dtype=np.int8)
+    return pd.Categorical.from_codes(bin_codes[bin_index], categories=categories)
+
+
+def _share(count: int, total: int) -> float:
+    """Anteil count/total (NaN bei total == 0, wie Series.mean auf leeren Daten)."""
+    return count / total if total else np.nan
+
+
+def _masked_mean(values: pd.Series, mask: np.ndarray) -> float:
+    """Mittelwert der Werte unter der Maske (NaN-Werte werden ignoriert)."""
+    selected = values.to_numpy(dtype=float)[mask]
+    return np.nanmean(selected) if np.any(~np.isnan(selected)) else np.nan
+
+
 @st.cache_data
 def get_data_summary(snapshot_df: pd.DataFrame) -> Dict:
     """
@@ -184,26 +424,39 @@ def get_data_summary(snapshot_df: pd.DataFrame) -> Dict:
     Returns:
         Dictionary mit KPIs
     """
-    # Nur besetzte Stellen
-    besetzt = snapshot_df[~snapshot_df["Is_Vacant"]]
+    # Spalten einmal als Arrays holen; Masken werden für Summe und Quote geteilt
+    is_vacant = snapshot_df["Is_Vacant"].to_numpy(dtype=bool)
+    besetzt = ~is_vacant
+    n_total = len(is_vacant)
+    n_besetzt = int(besetzt.sum())
+    vacancy_count = n_total - n_besetzt
+
+    teilzeit = besetzt & (snapshot_df["Arbeitszeit"].to_numpy() == "Teilzeit")
+    atz = besetzt & (snapshot_df["ATZ_Status"].to_numpy() != "Kein ATZ")
+    female = besetzt & (snapshot_df["Geschlecht"].to_numpy() == "w")
+    teilzeit_count = int(teilzeit.sum())
+    atz_count = int(atz.sum())
+    female_count = int(female.sum())
+
+    vacancy_rate = _share(vacancy_count, n_total)
 
     summary = {
-        "total_planstellen": len(snapshot_df),
-        "total_employees": besetzt["PersNr"].nunique(),
-        "total_fte": snapshot_df["FTE_assigned"].sum(),
-        "total_soll_fte": snapshot_df["Soll_FTE"].sum(),
-        "total_cost": snapshot_df["Total_Cost_Year"].sum(),
-        "vacancy_count": snapshot_df["Is_Vacant"].sum(),
-        "vacancy_rate": snapshot_df["Is_Vacant"].mean(),
-        "besetzungsgrad": 1 - snapshot_df["Is_Vacant"].mean(),
-        "avg_age": besetzt["Alter"].mean(),
-        "avg_tenure": besetzt["Betriebszugehörigkeit_Jahre"].mean(),
-        "teilzeit_count": (besetzt["Arbeitszeit"] == "Teilzeit").sum(),
-        "teilzeit_rate": (besetzt["Arbeitszeit"] == "Teilzeit").mean(),
-        "atz_count": (besetzt["ATZ_Status"] != "Kein ATZ").sum(),
-        "atz_rate": (besetzt["ATZ_Status"] != "Kein ATZ").mean(),
-        "female_count": (besetzt["Geschlecht"] == "w").sum(),
-        "female_rate": (besetzt["Geschlecht"] == "w").mean(),
+        "total_planstellen": n_total,
+        "total_employees": snapshot_df["PersNr"][besetzt].nunique(),
+        "total_fte": np.nansum(snapshot_df["FTE_assigned"].to_numpy(dtype=float)),
+        "total_soll_fte": np.nansum(snapshot_df["Soll_FTE"].to_numpy(dtype=float)),
+        "total_cost": np.nansum(snapshot_df["Total_Cost_Year"].to_numpy(dtype=float)),
+        "vacancy_count": vacancy_count,
+        "vacancy_rate": vacancy_rate,
+        "besetzungsgrad": 1 - vacancy_rate,
+        "avg_age": _masked_mean(snapshot_df["Alter"], besetzt),
+        "avg_tenure": _masked_mean(snapshot_df["Betriebszugehörigkeit_Jahre"], besetzt),
+        "teilzeit_count": teilzeit_count,
+        "teilzeit_rate": _share(teilzeit_count, n_besetzt),
+        "atz_count": atz_count,
+        "atz_rate": _share(atz_count, n_besetzt),
+        "female_count": female_count,
+        "female_rate": _share(female_count, n_besetzt),
     }
 
     return summary
@@ -219,8 +472,12 @@ def load_and_prepare_data() -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, D
     # Lade Rohdaten
     data = load_hr_data()
 
-    # Reichere Snapshot an
-    snapshot_df = enrich_snapshot_data(data["snapshot_detail"])
+    # Reichere Snapshot an; Kohorten (aus session_state, falls verfügbar) separat
+    cohorts = st.session_state.get("cohort_definitions", DEFAULT_COHORTS)
+    snapshot_df = _assign_cohorts(
+        enrich_snapshot_data(data["snapshot_detail"]),
+        tuple(cohorts.items())
+    )
 
     # Berechne Summary
     summary = get_data_summary(snapshot_df)
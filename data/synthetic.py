@@ -10,12 +10,15 @@ Generiert realistische HR-Daten für eine süddeutsche Sparkasse/Bank mit:
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+import hashlib
 import sys
 import os
 
 # Import settings
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 from config.settings import (
     BASE_SALARY, STEP_MULTIPLIER, EMPLOYER_COST_FACTOR,
     DEFAULT_COHORTS, TARIFF_GROUPS
@@ -45,6 +48,11 @@ ORG_UNITS = [
     {"kuerzel": "820", "name": "Risikomanagement", "target_size": 22},
 ]
 
+# Org-Einheiten spaltenweise für die vektorisierte Generierung
+_ORG_KUERZEL = np.array([org["kuerzel"] for org in ORG_UNITS], dtype=object)
+_ORG_NAME = np.array([org["name"] for org in ORG_UNITS], dtype=object)
+_ORG_TARGET_SIZE = np.array([org["target_size"] for org in ORG_UNITS], dtype=np.int64)
+
 # Altersverteilung
 AGE_DISTRIBUTION = {
     (16, 19): 0.07,   # Azubis
@@ -74,6 +82,9 @@ TARIFF_DISTRIBUTION = {
     "E13": 0.02, "E14": 0.01, "E15": 0.01
 }
 
+# Tarifstufen-Verteilung
+STEP_DISTRIBUTION = {3: 0.2, 4: 0.4, 5: 0.3, 6: 0.1}
+
 # Qualifikationsgruppen
 EDUCATION_DISTRIBUTION = {
     "derzeit Berufsausbildung": 0.09,
@@ -89,6 +100,23 @@ EDUCATION_DISTRIBUTION = {
     "nicht kfm Berufsabschluss": 0.02
 }
 
+# Qualifikation nach Tarifband (Nicht-Azubis, korreliert mit Tarif)
+EDUCATION_TARIFF_LOW = {  # E6-E8
+    "kfm Berufsabschluss": 0.4,
+    "Bankberufsabschluss": 0.6
+}
+EDUCATION_TARIFF_MID = {  # E9A-E9C
+    "Bankberufsabschluss": 0.3,
+    "Sparkassen/Bankfachwirt": 0.5,
+    "SPK/Bankbetriebswirt": 0.2
+}
+EDUCATION_TARIFF_HIGH = {  # ab E10
+    "SPK/Bankbetriebswirt": 0.4,
+    "Bachelor FH": 0.3,
+    "Master FH": 0.2,
+    "Master Universität": 0.1
+}
+
 # ATZ-Parameter
 ATZ_RATE_55PLUS = 0.23  # 23% der 55+ in ATZ
 ATZ_PHASE_SPLIT = {"Arbeitsphase": 0.5, "Freistellungsphase": 0.5}
@@ -96,6 +124,12 @@ ATZ_PHASE_SPLIT = {"Arbeitsphase": 0.5, "Freistellungsphase": 0.5}
 # Vakanzrate-Bereich
 VACANCY_RATE_RANGE = (0.15, 0.35)
 
+# Startwert des Zufallsgenerators (Reproduzierbarkeit)
+RANDOM_SEED = 42
+
+# Ablage generierter Daten als Parquet (Schlüssel: Parameter, Seed, Generator-Stand)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
 
 # =============================================================================
 # HILFSFUNKTIONEN
@@ -126,17 +160,174 @@ def calculate_cost(tariff: str, step: int, fte: float) -> float:
     return base * step_factor * fte * EMPLOYER_COST_FACTOR
 
 
-def weighted_choice(choices: Dict, size: int = 1):
-    """Zufallsauswahl basierend auf Gewichtung."""
-    items = list(choices.keys())
-    weights = list(choices.values())
+# Lookup-Tabellen für die vektorisierte Kostenberechnung (letzter Eintrag bzw.
+# Index 0 = Default für unbekannte Tarifgruppe/Stufe, wie in calculate_cost)
+_TARIFF_TO_CODE = {tariff: code for code, tariff in enumerate(TARIFF_GROUPS)}
+_BASE_SALARY_ARR = np.array([BASE_SALARY[t] for t in TARIFF_GROUPS] + [50000], dtype=np.float64)
+_STEP_MULT_ARR = np.array(
+    [1.0] + [STEP_MULTIPLIER.get(step, 1.0) for step in range(1, max(STEP_MULTIPLIER) + 1)],
+    dtype=np.float64
+)
+
+
+def _costs_from_codes(tariff_codes: np.ndarray, steps, ftes) -> np.ndarray:
+    """
+    Jahreskosten aus Tarif-Codes (Index in TARIFF_GROUPS), Stufen und FTE.
+
+    Args:
+        tariff_codes: Tarif-Codes (len(TARIFF_GROUPS) = unbekannte Tarifgruppe)
+        steps: Tarifstufen (1-6)
+        ftes: Beschäftigungsgrade (0-1)
+
+    Returns:
+        Array mit Jahreskosten in Euro
+    """
+    step_codes = np.asarray(steps, dtype=np.intp)
+    step_codes = np.where((step_codes >= 1) & (step_codes < len(_STEP_MULT_ARR)), step_codes, 0)
+    base = _BASE_SALARY_ARR[tariff_codes]
+    return base * _STEP_MULT_ARR[step_codes] * np.asarray(ftes, dtype=np.float64) * EMPLOYER_COST_FACTOR
+
+
+def _distribution_table(choices: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Baut Werte-Array und kumulierte Wahrscheinlichkeiten einer Verteilung.
+
+    Args:
+        choices: Dictionary Wert -> Gewicht
+
+    Returns:
+        Tuple aus (Werte, kumulierte Wahrscheinlichkeiten, auf 1 normiert)
+    """
+    values = np.array(list(choices.keys()))
+    cumulative = np.cumsum(list(choices.values()), dtype=np.float64)
+    return values, cumulative / cumulative[-1]
+
+
+# Ziehungstabellen, einmal beim Import aufgebaut
+_DIST_TABLES = {
+    "gender": _distribution_table(GENDER_DISTRIBUTION),
+    "age": _distribution_table(AGE_DISTRIBUTION),
+    "employment": _distribution_table(EMPLOYMENT_DISTRIBUTION),
+    "tariff": _distribution_table(TARIFF_DISTRIBUTION),
+    "step": _distribution_table(STEP_DISTRIBUTION),
+}
+
+# Kategorien der Stufen-Spalte "St" (Position = Index in der Stufenverteilung)
+_STEP_CATEGORIES = _DIST_TABLES["step"][0].astype(str)
+
+
+def _conditional_table(distributions: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Baut eine gemeinsame Ziehungstabelle für mehrere bedingte Verteilungen.
+
+    Args:
+        distributions: Verteilungen (Wert -> Gewicht), Position = Gruppen-ID
+
+    Returns:
+        Tuple aus (Werte, kumulierte Wahrscheinlichkeiten je Gruppe als Zeile)
+    """
+    values = list(dict.fromkeys(value for dist in distributions for value in dist))
+    weights = np.array([[dist.get(value, 0.0) for value in values] for dist in distributions])
+    cumulative = np.cumsum(weights, axis=1)
+    return np.array(values, dtype=object), cumulative / cumulative[:, -1:]
+
+
+# Qualifikation je Gruppe: 0 = Azubi, 1-3 = Tarifband niedrig/mittel/hoch
+_EDUCATION_TABLE = _conditional_table([
+    {"derzeit Berufsausbildung": 1.0},
+    EDUCATION_TARIFF_LOW,
+    EDUCATION_TARIFF_MID,
+    EDUCATION_TARIFF_HIGH,
+])
+
+# Tarifband (1-3) je Wert der Tarifverteilung
+_TARIFF_BAND = np.select(
+    [
+        np.isin(_DIST_TABLES["tariff"][0], ["E6", "E7", "E8"]),
+        np.isin(_DIST_TABLES["tariff"][0], ["E9A", "E9B", "E9C"]),
+    ],
+    [1, 2],
+    default=3
+)
+
+
+def _sample_index(rng: np.random.Generator, name: str, size: int) -> np.ndarray:
+    """
+    Zieht gewichtete Positionen in den Werten einer vorberechneten Verteilung.
+
+    Args:
+        rng: Zufallsgenerator
+        name: Schlüssel in _DIST_TABLES
+        size: Anzahl Ziehungen
+
+    Returns:
+        Array mit Indizes in die Werte der Verteilung
+    """
+    _, cumulative = _DIST_TABLES[name]
+    return np.searchsorted(cumulative, rng.random(size), side="right")
+
+
+def _sample(rng: np.random.Generator, name: str, size: int) -> np.ndarray:
+    """
+    Zieht gewichtete Zufallswerte aus einer vorberechneten Verteilung.
+
+    Args:
+        rng: Zufallsgenerator
+        name: Schlüssel in _DIST_TABLES
+        size: Anzahl Ziehungen
+
+    Returns:
+        Array mit gezogenen Werten (Altersbereiche als Zeilen (Min, Max))
+    """
+    return _DIST_TABLES[name][0][_sample_index(rng, name, size)]
+
+
+# Tarif-Code (Index in TARIFF_GROUPS) je Wert der Tarifverteilung
+_TARIFF_DIST_CODES = np.array(
+    [_TARIFF_TO_CODE.get(t, len(TARIFF_GROUPS)) for t in _DIST_TABLES["tariff"][0]],
+    dtype=np.intp
+)
+
+
+def _years_before(ref_date: pd.Timestamp, years: np.ndarray) -> np.ndarray:
+    """
+    Zieht ganze Jahre vektorisiert vom Stichtag ab.
+
+    Entspricht ref_date - pd.DateOffset(years=n) je Element: Tag und Monat
+    bleiben erhalten, ein 29.02. wird in Nicht-Schaltjahren zum 28.02.
+
+    Args:
+        ref_date: Stichtag
+        years: Anzahl Jahre
+
+    Returns:
+        datetime64[ns]-Array
+    """
+    ref_month = np.datetime64(ref_date.to_datetime64(), "M")
+    month = ref_month - (np.asarray(years, dtype=np.int64) * 12).astype("timedelta64[M]")
+    month_start = month.astype("datetime64[D]")
+    month_days = ((month + 1).astype("datetime64[D]") - month_start).astype(np.int64)
+    day_offset = np.minimum(ref_date.day, month_days) - 1
+    time_of_day = (ref_date - ref_date.normalize()).to_timedelta64()
+    return (month_start + day_offset.astype("timedelta64[D]")).astype("datetime64[ns]") + time_of_day
+
+
+def _fill_besetzt(besetzt: np.ndarray, values, fill=np.nan, dtype=object) -> np.ndarray:
+    """
+    Legt eine Spalte über alle Stellen an und füllt die besetzten Positionen.
 
-    # Handle special case where items are tuples (e.g., age ranges)
-    if items and isinstance(items[0], tuple):
-        indices = np.random.choice(len(items), size=size, p=weights)
-        return [items[i] for i in indices]
+    Args:
+        besetzt: Boolesche Maske der besetzten Stellen
+        values: Werte für die besetzten Stellen (Array oder Skalar)
+        fill: Wert für vakante Stellen
+        dtype: Dtype der Spalte
 
-    return np.random.choice(items, size=size, p=weights)
+    Returns:
+        Array über alle Stellen
+    """
+    column = np.full(len(besetzt), fill, dtype=dtype)
+    column[besetzt] = values
+    return column
 
 
 # =============================================================================
@@ -146,7 +337,8 @@ def weighted_choice(choices: Dict, size: int = 1):
 def generate_snapshot_detail(
     n_employees: int = 1200,
     n_planstellen: int = 1700,
-    reference_date: str = "2026-01-01"
+    reference_date: str = "2026-01-01",
+    rng: Optional[np.random.Generator] = None
 ) -> pd.DataFrame:
     """
     Generiert die Snapshot_Detail Tabelle.
@@ -155,157 +347,127 @@ def generate_snapshot_detail(
         n_employees: Anzahl Mitarbeitende
         n_planstellen: Anzahl Planstellen (inkl. Vakanzen)
         reference_date: Stichtag
+        rng: Zufallsgenerator (Default: neu mit RANDOM_SEED)
 
     Returns:
         DataFrame mit Snapshot-Daten
     """
-    np.random.seed(42)  # Reproduzierbarkeit
+    if rng is None:
+        rng = np.random.default_rng(RANDOM_SEED)  # Reproduzierbarkeit
     ref_date = pd.to_datetime(reference_date)
 
-    data = []
-    person_id_counter = 10000
-    planstellen_id_counter = 1
-
     # Normalisiere Org-Einheiten Größen
-    total_target = sum(org["target_size"] for org in ORG_UNITS)
-    scaling = n_planstellen / total_target
-
-    for org in ORG_UNITS:
-        n_stellen_org = int(org["target_size"] * scaling)
-        vacancy_rate = np.random.uniform(*VACANCY_RATE_RANGE)
-        n_besetzt = int(n_stellen_org * (1 - vacancy_rate))
-        n_vakant = n_stellen_org - n_besetzt
-
-        # Besetzte Stellen
-        for i in range(n_besetzt):
-            # Person generieren
-            gender = weighted_choice(GENDER_DISTRIBUTION)[0]
-            age_range = weighted_choice(AGE_DISTRIBUTION)[0]
-            age = np.random.randint(age_range[0], age_range[1] + 1)
-            birth_date = ref_date - pd.DateOffset(years=age)
-
-            # Beschäftigungsgrad
-            bs_grd = weighted_choice(EMPLOYMENT_DISTRIBUTION)[0]
-
-            # Tarifgruppe & Stufe
-            tariff = weighted_choice(TARIFF_DISTRIBUTION)[0]
-            step = np.random.choice([3, 4, 5, 6], p=[0.2, 0.4, 0.3, 0.1])
-
-            # Qualifikation (korreliert mit Alter und Tarif)
-            if age < 20:
-                education = "derzeit Berufsausbildung"
-            elif tariff in ["E6", "E7", "E8"]:
-                education = weighted_choice({
-                    "kfm Berufsabschluss": 0.4,
-                    "Bankberufsabschluss": 0.6
-                })[0]
-            elif tariff in ["E9A", "E9B", "E9C"]:
-                education = weighted_choice({
-                    "Bankberufsabschluss": 0.3,
-                    "Sparkassen/Bankfachwirt": 0.5,
-                    "SPK/Bankbetriebswirt": 0.2
-                })[0]
-            else:
-                education = weighted_choice({
-                    "SPK/Bankbetriebswirt": 0.4,
-                    "Bachelor FH": 0.3,
-                    "Master FH": 0.2,
-                    "Master Universität": 0.1
-                })[0]
-
-            # Eintrittsdatum (zwischen 1 und 40 Jahren Betriebszugehörigkeit)
-            tenure_years = int(min(np.random.exponential(10), age - 16))
-            entry_date = ref_date - pd.DateOffset(years=tenure_years)
-
-            # ATZ-Status (nur für 55+)
-            vertragsart = "Unbefristet"
-            if age >= 55:
-                if np.random.random() < ATZ_RATE_55PLUS:
-                    vertragsart = "Altersteilzeit"
-            elif age < 20:
-                vertragsart = "Auszubildende"
-
-            # FTE-Werte
-            fte_person = bs_grd
-            soll_fte = 1.0  # Planstelle ist immer 1.0 FTE
-            fte_assigned = fte_person  # Was die Person tatsächlich bringt
-
-            # Kosten
-            total_cost = calculate_cost(tariff, step, fte_person)
-
-            data.append({
-                "Kürzel OrgEinheit": org["kuerzel"],
-                "OrgEinheitNr": float(org["kuerzel"]),
-                "Organisationseinheit": org["name"],
-                "Planstellennr": float(planstellen_id_counter),
-                "Planstelle": f"Planstelle {planstellen_id_counter}",
-                "Sollarbeitszeit": 39.0,
-                "Bewertung Tarifgruppe": tariff,
-                "Personalnummer": float(person_id_counter),
-                "Soll_FTE": soll_fte,
-                "PersNr": float(person_id_counter),
-                "GebDatum": birth_date,
-                "Text Gsch": "weiblich" if gender == "w" else "männlich",
-                "Eintritt": entry_date,
-                "Austritt": pd.NaT,
-                "BsGrd": bs_grd * 100,  # in Prozent
-                "Vertragsart": vertragsart,
-                "Status kundenindividuell": "Aktives Beschäftigungsverhältnis",
-                "Tarifarttext": "TVöD" if vertragsart != "Auszubildende" else "Auszubildende-VKA",
-                "TrfGr": tariff,
-                "St": str(step),
-                "FTE_person": fte_person,
-                "Total_Cost_Year": total_cost,
-                "Is_Vacant": False,
-                "FTE_assigned": fte_assigned,
-                "Ausbildung": education,
-            })
-
-            person_id_counter += 1
-            planstellen_id_counter += 1
-
-        # Vakante Stellen
-        for i in range(n_vakant):
-            tariff = weighted_choice(TARIFF_DISTRIBUTION)[0]
-
-            data.append({
-                "Kürzel OrgEinheit": org["kuerzel"],
-                "OrgEinheitNr": float(org["kuerzel"]),
-                "Organisationseinheit": org["name"],
-                "Planstellennr": float(planstellen_id_counter),
-                "Planstelle": f"Planstelle {planstellen_id_counter}",
-                "Sollarbeitszeit": 39.0,
-                "Bewertung Tarifgruppe": tariff,
-                "Personalnummer": np.nan,
-                "Soll_FTE": 1.0,
-                "PersNr": np.nan,
-                "GebDatum": pd.NaT,
-                "Text Gsch": np.nan,
-                "Eintritt": pd.NaT,
-                "Austritt": pd.NaT,
-                "BsGrd": np.nan,
-                "Vertragsart": np.nan,
-                "Status kundenindividuell": np.nan,
-                "Tarifarttext": np.nan,
-                "TrfGr": np.nan,
-                "St": np.nan,
-                "FTE_person": 0.0,
-                "Total_Cost_Year": 0.0,
-                "Is_Vacant": True,
-                "FTE_assigned": 0.0,
-                "Ausbildung": np.nan,
-            })
-
-            planstellen_id_counter += 1
-
-    df = pd.DataFrame(data)
+    scaling = n_planstellen / _ORG_TARGET_SIZE.sum()
+
+    # Besetzte und vakante Stellen je Org-Einheit
+    n_stellen_org = (_ORG_TARGET_SIZE * scaling).astype(int)
+    vacancy_rates = rng.uniform(*VACANCY_RATE_RANGE, size=len(ORG_UNITS))
+    n_besetzt_org = (n_stellen_org * (1 - vacancy_rates)).astype(int)
+    n_vakant_org = n_stellen_org - n_besetzt_org
+
+    n_besetzt = int(n_besetzt_org.sum())
+    n_vakant = int(n_vakant_org.sum())
+    n_total = n_besetzt + n_vakant
+
+    # Stellen-Layout: je Org-Einheit erst die besetzten, dann die vakanten Stellen
+    block_sizes = np.ravel(np.column_stack([n_besetzt_org, n_vakant_org]))
+    is_vacant = np.repeat(np.tile([False, True], len(ORG_UNITS)), block_sizes)
+    besetzt = ~is_vacant
+    org_index = np.repeat(np.arange(len(ORG_UNITS)), n_stellen_org)
+    planstellen_ids = np.arange(1, n_total + 1)
+
+    # Personen aller besetzten Stellen in einem Zug ziehen
+    gender = _sample(rng, "gender", n_besetzt)
+    age_ranges = _sample(rng, "age", n_besetzt)
+    age = rng.integers(age_ranges[:, 0], age_ranges[:, 1] + 1)
+
+    # Beschäftigungsgrad
+    bs_grd = _sample(rng, "employment", n_besetzt)
+
+    # Tarifgruppe & Stufe
+    tariff_index = _sample_index(rng, "tariff", n_besetzt)
+    tariff = _DIST_TABLES["tariff"][0][tariff_index]
+    step_index = _sample_index(rng, "step", n_besetzt)
+    step = _DIST_TABLES["step"][0][step_index]
+
+    # Qualifikation (korreliert mit Alter und Tarif)
+    # in einem Durchlauf: Gruppe je Person, dann eine Ziehung aus der Zeile ihrer Gruppe
+    is_azubi = age < 20
+    education_group = np.where(is_azubi, 0, _TARIFF_BAND[tariff_index])
+    education_values, education_cumulative = _EDUCATION_TABLE
+    education_index = (education_cumulative[education_group] <= rng.random(n_besetzt)[:, None]).sum(axis=1)
+    education = education_values[education_index]
+
+    # Eintrittsdatum (zwischen 1 und 40 Jahren Betriebszugehörigkeit)
+    tenure_years = np.minimum(rng.exponential(10, size=n_besetzt), age - 16).astype(int)
+
+    # ATZ-Status (nur für 55+)
+    is_atz = (age >= 55) & (rng.random(n_besetzt) < ATZ_RATE_55PLUS)
+    vertragsart = np.where(is_azubi, "Auszubildende", np.where(is_atz, "Altersteilzeit", "Unbefristet"))
+
+    # Vakante Stellen: nur die bewertete Tarifgruppe der Stelle
+    tariff_vakant = _sample(rng, "tariff", n_vakant)
+
+    bewertung = np.empty(n_total, dtype=object)
+    bewertung[besetzt] = tariff
+    bewertung[is_vacant] = tariff_vakant
+
+    birth_dates = _years_before(ref_date, age)
+    entry_dates = _years_before(ref_date, tenure_years)
+    fte_assigned = _fill_besetzt(besetzt, bs_grd, 0.0, np.float64)
+
+    # Kosten direkt aus den gezogenen Tarif-Indizes
+    costs = _costs_from_codes(_TARIFF_DIST_CODES[tariff_index], step, bs_grd)
+
+    # Personalnummern nur für besetzte Stellen (nullable Integer statt float mit NaN)
+    person_numbers = pd.arrays.IntegerArray(
+        _fill_besetzt(besetzt, 10000 + np.arange(n_besetzt), 0, np.int64),
+        is_vacant.copy()
+    )
+
+    df = pd.DataFrame({
+        "Kürzel OrgEinheit": pd.Categorical.from_codes(org_index, categories=_ORG_KUERZEL),
+        "OrgEinheitNr": _ORG_KUERZEL[org_index].astype(float),
+        "Organisationseinheit": pd.Categorical.from_codes(org_index, categories=_ORG_NAME),
+        "Planstellennr": planstellen_ids,
+        "Planstelle": np.char.add("Planstelle ", planstellen_ids.astype(str)),
+        "Sollarbeitszeit": np.full(n_total, 39.0),
+        "Bewertung Tarifgruppe": pd.Categorical(bewertung, categories=TARIFF_GROUPS),
+        "Personalnummer": person_numbers,
+        "Soll_FTE": np.ones(n_total),  # Planstelle ist immer 1.0 FTE
+        "PersNr": person_numbers.copy(),
+        "GebDatum": _fill_besetzt(besetzt, birth_dates, np.datetime64("NaT"), "datetime64[ns]"),
+        "Text Gsch": pd.Categorical(
+            _fill_besetzt(besetzt, np.where(gender == "w", "weiblich", "männlich")),
+            categories=["männlich", "weiblich"]
+        ),
+        "Eintritt": _fill_besetzt(besetzt, entry_dates, np.datetime64("NaT"), "datetime64[ns]"),
+        "Austritt": np.full(n_total, np.datetime64("NaT"), dtype="datetime64[ns]"),
+        "BsGrd": _fill_besetzt(besetzt, bs_grd * 100, np.nan, np.float64),  # in Prozent
+        "Vertragsart": pd.Categorical(_fill_besetzt(besetzt, vertragsart)),
+        "Status kundenindividuell": pd.Categorical(_fill_besetzt(besetzt, "Aktives Beschäftigungsverhältnis")),
+        "Tarifarttext": pd.Categorical(
+            _fill_besetzt(besetzt, np.where(vertragsart != "Auszubildende", "TVöD", "Auszubildende-VKA"))
+        ),
+        "TrfGr": pd.Categorical(_fill_besetzt(besetzt, tariff), categories=TARIFF_GROUPS),
+        "St": pd.Categorical.from_codes(
+            _fill_besetzt(besetzt, step_index, -1, np.int8), categories=_STEP_CATEGORIES
+        ),
+        "FTE_person": fte_assigned,
+        "Total_Cost_Year": _fill_besetzt(besetzt, costs, 0.0, np.float64),
+        "Is_Vacant": is_vacant,
+        "FTE_assigned": fte_assigned.copy(),  # Was die Person tatsächlich bringt
+        "Ausbildung": pd.Categorical(_fill_besetzt(besetzt, education), categories=_EDUCATION_TABLE[0]),
+    })
+
     return df
 
 
 def generate_history_cube(
     snapshot_df: pd.DataFrame,
     start_date: str = "2024-01-01",
-    end_date: str = "2026-01-18"
+    end_date: str = "2026-01-18",
+    rng: Optional[np.random.Generator] = None
 ) -> pd.DataFrame:
     """
     Generiert History_Cube (monatliche Zeitreihen).
@@ -314,78 +476,110 @@ def generate_history_cube(
         snapshot_df: Snapshot_Detail DataFrame
         start_date: Startdatum
         end_date: Enddatum
+        rng: Zufallsgenerator (Default: neu mit RANDOM_SEED)
 
     Returns:
         DataFrame mit monatlichen Aggregaten pro OrgEinheit
     """
+    if rng is None:
+        rng = np.random.default_rng(RANDOM_SEED)
+
     start = pd.to_datetime(start_date)
     end = pd.to_datetime(end_date)
 
     # Monatliche Stichtage
     dates = pd.date_range(start=start, end=end, freq='MS')
 
-    data = []
-
-    for org_unit in snapshot_df["Kürzel OrgEinheit"].unique():
-        org_data = snapshot_df[snapshot_df["Kürzel OrgEinheit"] == org_unit]
-
-        # Basis-Werte (aktueller Stand)
-        base_headcount = org_data[~org_data["Is_Vacant"]]["PersNr"].nunique()
-        base_fte = org_data["FTE_assigned"].sum()
-        base_cost = org_data["Total_Cost_Year"].sum()
-        base_vacancy = org_data["Is_Vacant"].sum()
-
-        for date in dates:
-            # Leichte Variation über Zeit (Trend + Noise)
-            months_from_start = (date.year - start.year) * 12 + (date.month - start.month)
-            trend_factor = 1.0 + (months_from_start / 100)  # Langsames Wachstum
-            noise = np.random.normal(1.0, 0.02)  # 2% Schwankung
-
-            headcount = int(base_headcount * trend_factor * noise)
-            fte = base_fte * trend_factor * noise
-            cost = base_cost * trend_factor * noise
-            vacancy = int(base_vacancy * noise)
-
-            data.append({
-                "Kürzel OrgEinheit": org_unit,
-                "Date": date,
-                "Headcount": headcount,
-                "FTE": fte,
-                "Total_Cost": cost,
-                "Vacancy_Count": vacancy,
-            })
-
-    df = pd.DataFrame(data)
+    # Basis-Werte je Org-Einheit (aktueller Stand, Reihenfolge wie im Snapshot) in
+    # einem Durchlauf; vakante Stellen haben keine PersNr und fallen bei nunique heraus
+    base = snapshot_df.groupby("Kürzel OrgEinheit", sort=False, observed=True).agg(
+        headcount=("PersNr", "nunique"),
+        fte=("FTE_assigned", "sum"),
+        cost=("Total_Cost_Year", "sum"),
+        vacancy=("Is_Vacant", "sum"),
+    )
+    org_units = base.index.astype(object)
+
+    # Leichte Variation über Zeit (Trend + Noise) als Matrix Org-Einheit x Monat
+    months_from_start = (dates.year - start.year) * 12 + (dates.month - start.month)
+    trend_factor = 1.0 + (months_from_start.to_numpy() / 100)  # Langsames Wachstum
+    noise = rng.normal(1.0, 0.02, size=(len(org_units), len(dates)))  # 2% Schwankung
+
+    def scaled(base_values: pd.Series) -> np.ndarray:
+        return base_values.to_numpy(dtype=np.float64)[:, None] * trend_factor * noise
+
+    vacancy = base["vacancy"].to_numpy(dtype=np.float64)[:, None] * noise
+
+    # Langformat direkt aus den Matrizen (Org-Einheit-major), Org-Spalte über Codes
+    org_codes = np.repeat(np.arange(len(org_units)), len(dates))
+    df = pd.DataFrame({
+        "Kürzel OrgEinheit": pd.Categorical.from_codes(org_codes, categories=org_units),
+        "Date": np.tile(dates.to_numpy(), len(org_units)),
+        "Headcount": scaled(base["headcount"]).astype(np.int64).ravel(),
+        "FTE": scaled(base["fte"]).ravel(),
+        "Total_Cost": scaled(base["cost"]).ravel(),
+        "Vacancy_Count": vacancy.astype(np.int64).ravel(),
+    })
     return df
 
 
 def generate_org_structure() -> pd.DataFrame:
     """Generiert Organisationsstruktur-Tabelle."""
-    data = [
-        {
-            "Kürzel OrgEinheit": org["kuerzel"],
-            "OrgEinheitNr": float(org["kuerzel"]),
-            "Organisationseinheit": org["name"],
-        }
-        for org in ORG_UNITS
-    ]
-    return pd.DataFrame(data)
+    return pd.DataFrame({
+        "Kürzel OrgEinheit": _ORG_KUERZEL,
+        "OrgEinheitNr": _ORG_KUERZEL.astype(float),
+        "Organisationseinheit": _ORG_NAME,
+    })
+
+
+def _cache_paths(
+    n_employees: int,
+    n_planstellen: int,
+    start_date: str,
+    end_date: str
+) -> Dict[str, str]:
+    """
+    Liefert die Parquet-Pfade für einen Parametersatz.
+
+    Der Schlüssel enthält die Parameter, den Seed und den Änderungszeitpunkt
+    dieses Moduls, damit Änderungen am Generator den Cache verwerfen.
+
+    Args:
+        n_employees: Anzahl Mitarbeitende
+        n_planstellen: Anzahl Planstellen
+        start_date: Startdatum für Historie
+        end_date: Enddatum für Historie
+
+    Returns:
+        Dictionary Tabellen-Name -> Parquet-Pfad
+    """
+    signature = (n_employees, n_planstellen, start_date, end_date, RANDOM_SEED, os.path.getmtime(__file__))
+    key = hashlib.blake2b(repr(signature).encode(), digest_size=8).hexdigest()
+    return {
+        name: os.path.join(CACHE_DIR, f"{name}_{key}.parquet")
+        for name in ("snapshot_detail", "history_cube", "org_structure")
+    }
 
 
 def generate_synthetic_data(
     n_employees: int = 1200,
     n_planstellen: int = 1700,
     start_date: str = "2024-01-01",
-    end_date: str = "2026-01-18"
+    end_date: str = "2026-01-18",
+    use_cache: bool = True
 ) -> Dict[str, pd.DataFrame]:
     """
     Generiert alle benötigten DataFrames.
 
+    Mit use_cache werden bereits generierte Daten für dieselben Parameter aus
+    Parquet-Dateien in CACHE_DIR geladen und neu generierte dort abgelegt.
+
     Args:
         n_employees: Anzahl Mitarbeitende
         n_planstellen: Anzahl Planstellen
         start_date: Startdatum für Historie
         end_date: Enddatum für Historie
+        use_cache: Parquet-Cache verwenden
 
     Returns:
         Dictionary mit DataFrames:
@@ -393,33 +587,65 @@ def generate_synthetic_data(
         - history_cube
         - org_structure
     """
+    cache_paths = _cache_paths(n_employees, n_planstellen, start_date, end_date) if use_cache else {}
+    if cache_paths and all(os.path.exists(path) for path in cache_paths.values()):
+        print("Lade generierte Daten aus Cache...")
+        return {name: pd.read_parquet(path) for name, path in cache_paths.items()}
+
+    # Ein Generator für alle Tabellen: Historie setzt den Zufallsstrom des Snapshots fort
+    rng = np.random.default_rng(RANDOM_SEED)
+
     print("Generiere Snapshot_Detail...")
-    snapshot_df = generate_snapshot_detail(n_employees, n_planstellen)
+    snapshot_df = generate_snapshot_detail(n_employees, n_planstellen, rng=rng)
 
     print("Generiere History_Cube...")
-    history_df = generate_history_cube(snapshot_df, start_date, end_date)
+    history_df = generate_history_cube(snapshot_df, start_date, end_date, rng=rng)
 
     print("Generiere Org_Structure...")
     org_df = generate_org_structure()
 
     print("Fertig!")
 
-    return {
+    data = {
         "snapshot_detail": snapshot_df,
         "history_cube": history_df,
         "org_structure": org_df
     }
 
+    if cache_paths:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            for name, path in cache_paths.items():
+                data[name].to_parquet(path, index=False, compression="zstd")
+        except (OSError, ValueError, TypeError, ImportError):
+            # Kein Schreibzugriff oder keine Parquet-Engine: Daten bleiben nur im Speicher
+            pass
 
-def save_to_excel(data_dict: Dict[str, pd.DataFrame], filepath: str):
+    return data
+
+
+def save_to_excel(data_dict: Dict[str, pd.DataFrame], filepath: str, engine: Optional[str] = None):
     """
     Speichert alle DataFrames in eine Excel-Datei.
 
+    Ohne Angabe wird xlsxwriter verwendet (deutlich schneller beim Schreiben),
+    falls installiert, sonst openpyxl. Den constant_memory-Modus von xlsxwriter
+    nutzen wir nicht: pandas schreibt spaltenweise, der Modus erwartet Zeilen
+    in Reihenfolge und verwirft sonst Zellen.
+
     Args:
         data_dict: Dictionary mit DataFrames
         filepath: Ziel-Dateipfad
+        engine: Excel-Engine ("xlsxwriter" oder "openpyxl")
     """
-    with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+    if engine is None:
+        try:
+            import xlsxwriter  # noqa: F401
+            engine = "xlsxwriter"
+        except ImportError:
+            engine = "openpyxl"
+
+    with pd.ExcelWriter(filepath, engine=engine) as writer:
         for sheet_name, df in data_dict.items():
             df.to_excel(writer, sheet_name=sheet_name, index=False)
 
@@ -451,9 +677,12 @@ if __name__ == "__main__":
     print("\n" + "=" * 60)
     print("STATISTIKEN:")
     print("=" * 60)
-    print(f"Snapshot_Detail: {len(data['snapshot_detail']):,} Zeilen")
-    print(f"  - Mitarbeitende: {data['snapshot_detail'][~data['snapshot_detail']['Is_Vacant']]['PersNr'].nunique():,}")
-    print(f"  - Planstellen: {data['snapshot_detail']['Planstellennr'].nunique():,}")
-    print(f"  - Vakanzen: {data['snapshot_detail']['Is_Vacant'].sum():,}")
+    snapshot = data["snapshot_detail"]
+    n_vakanzen = int(snapshot["Is_Vacant"].sum())
+    print(f"Snapshot_Detail: {len(snapshot):,} Zeilen")
+    # Generator vergibt je besetzter Stelle eine eigene Personalnummer
+    print(f"  - Mitarbeitende: {len(snapshot) - n_vakanzen:,}")
+    print(f"  - Planstellen: {snapshot['Planstellennr'].nunique():,}")
+    print(f"  - Vakanzen: {n_vakanzen:,}")
     print(f"\nHistory_Cube: {len(data['history_cube']):,} Zeilen")
     print(f"Org_Structure: {len(data['org_structure']):,} Zeilen")
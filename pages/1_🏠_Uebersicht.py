@@ -6,11 +6,14 @@ Zeigt zentrale KPIs und Zusammenfassung der HR-Daten.
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import sys
 import os
 
 # Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:  # Seiten laufen bei jedem Rerun erneut
+    sys.path.append(_ROOT)
 
 from data.loader import load_and_prepare_data
 from config.settings import format_number, format_currency, format_percent, get_status_color, THRESHOLDS
@@ -135,6 +138,7 @@ def main():
 
         # Nur besetzte Stellen für Analysen
         active_df = filtered_df[~filtered_df["Is_Vacant"]]
+        value_col = "FTE_assigned" if view_mode == "MAK" else "Total_Cost_Year"
 
         # Row 1: Zeitreihe
         if not history_df.empty:
@@ -142,22 +146,9 @@ def main():
             metric_info("Zeitreihenanalyse",
                        "Zeigt die historische Entwicklung der Personalkapazität. Trends und saisonale Muster werden sichtbar.")
 
-            # Filter History nach Datumsbereich
-            if st.session_state.get("date_range"):
-                date_range = st.session_state["date_range"]
-                history_filtered = history_df[
-                    (history_df["Date"] >= pd.to_datetime(date_range[0])) &
-                    (history_df["Date"] <= pd.to_datetime(date_range[1]))
-                ]
-            else:
-                history_filtered = history_df
-
-            # Aggregiere über alle Org-Einheiten
-            time_series = history_filtered.groupby("Date").agg({
-                "FTE": "sum",
-                "Total_Cost": "sum",
-                "Headcount": "sum"
-            }).reset_index()
+            # History nach Datumsbereich filtern und über alle Org-Einheiten aggregieren
+            date_range = st.session_state.get("date_range")
+            time_series = _aggregate_history(history_df, tuple(date_range) if date_range else None)
 
             y_col = "FTE" if view_mode == "MAK" else "Total_Cost"
             fig_timeline = create_line_chart(
@@ -166,16 +157,14 @@ def main():
                 y_col=y_col,
                 title=f"{'Kapazität (FTE)' if view_mode == 'MAK' else 'Gesamtkosten (€)'} - Zeitverlauf"
             )
-            st.plotly_chart(fig_timeline, use_container_width=True)
+            st.plotly_chart(fig_timeline, use_container_width=True, key="uebersicht_timeline")
 
         # Row 2: Donut Charts
         col1, col2 = st.columns(2)
 
         with col1:
             st.markdown("#### Verteilung nach Geschlecht")
-            gender_dist = active_df.groupby("Geschlecht").agg({
-                "FTE_assigned" if view_mode == "MAK" else "Total_Cost_Year": "sum"
-            }).reset_index()
+            gender_dist = _sum_by_group(active_df, "Geschlecht", value_col)
             gender_dist.columns = ["Geschlecht", "Wert"]
             gender_dist["Geschlecht"] = gender_dist["Geschlecht"].map({"m": "Männlich", "w": "Weiblich"})
 
@@ -185,13 +174,11 @@ def main():
                 names_col="Geschlecht",
                 title=""
             )
-            st.plotly_chart(fig_gender, use_container_width=True)
+            st.plotly_chart(fig_gender, use_container_width=True, key="uebersicht_gender")
 
         with col2:
             st.markdown("#### Verteilung nach Arbeitszeit")
-            employment_dist = active_df.groupby("Arbeitszeit").agg({
-                "FTE_assigned" if view_mode == "MAK" else "Total_Cost_Year": "sum"
-            }).reset_index()
+            employment_dist = _sum_by_group(active_df, "Arbeitszeit", value_col)
             employment_dist.columns = ["Arbeitszeit", "Wert"]
 
             fig_employment = create_donut_chart(
@@ -200,13 +187,11 @@ def main():
                 names_col="Arbeitszeit",
                 title=""
             )
-            st.plotly_chart(fig_employment, use_container_width=True)
+            st.plotly_chart(fig_employment, use_container_width=True, key="uebersicht_employment")
 
         # Row 3: Top Organisationseinheiten
         st.markdown("#### Top 10 Organisationseinheiten")
-        org_agg = active_df.groupby("Organisationseinheit").agg({
-            "FTE_assigned" if view_mode == "MAK" else "Total_Cost_Year": "sum"
-        }).reset_index()
+        org_agg = _sum_by_group(active_df, "Organisationseinheit", value_col)
         org_agg.columns = ["Organisation", "Wert"]
         org_agg = org_agg.nlargest(10, "Wert")
 
@@ -217,13 +202,11 @@ def main():
             orientation="h",
             title=""
         )
-        st.plotly_chart(fig_org, use_container_width=True)
+        st.plotly_chart(fig_org, use_container_width=True, key="uebersicht_top_orgs")
 
         # Row 4: Alterskohorten
         st.markdown("#### Verteilung nach Alterskohorte")
-        cohort_agg = active_df.groupby("Alterskohorte").agg({
-            "FTE_assigned" if view_mode == "MAK" else "Total_Cost_Year": "sum"
-        }).reset_index()
+        cohort_agg = _sum_by_group(active_df, "Alterskohorte", value_col)
         cohort_agg.columns = ["Kohorte", "Wert"]
 
         fig_cohort = create_bar_chart(
@@ -232,7 +215,7 @@ def main():
             y_col="Wert",
             title=""
         )
-        st.plotly_chart(fig_cohort, use_container_width=True)
+        st.plotly_chart(fig_cohort, use_container_width=True, key="uebersicht_cohorts")
 
         # Debug-Info (expandable)
         with st.expander("🔍 Debug: Daten-Übersicht"):
@@ -263,27 +246,88 @@ def main():
         st.code(traceback.format_exc())
 
 
+# =============================================================================
+# AGGREGATIONEN
+# =============================================================================
+
+# Bewusst ungecacht: st.cache_data müsste die DataFrames bei jedem Aufruf
+# inhaltlich hashen, was teurer ist als die einspaltigen groupbys selbst.
+
+
+def _aggregate_history(history_df: pd.DataFrame, date_range: tuple = None) -> pd.DataFrame:
+    """
+    Filtert die History auf den Datumsbereich und summiert je Stichtag.
+
+    Args:
+        history_df: History DataFrame
+        date_range: (Start, Ende) oder None für den gesamten Zeitraum
+
+    Returns:
+        DataFrame mit Date, FTE, Total_Cost und Headcount je Stichtag
+    """
+    if date_range:
+        history_df = history_df[
+            (history_df["Date"] >= pd.to_datetime(date_range[0])) &
+            (history_df["Date"] <= pd.to_datetime(date_range[1]))
+        ]
+    return history_df.groupby("Date").agg({
+        "FTE": "sum",
+        "Total_Cost": "sum",
+        "Headcount": "sum"
+    }).reset_index()
+
+
+def _sum_by_group(df: pd.DataFrame, group_col: str, value_col: str) -> pd.DataFrame:
+    """
+    Summiert eine Wertspalte je Ausprägung einer Gruppierungsspalte.
+
+    Args:
+        df: DataFrame (besetzte Stellen)
+        group_col: Gruppierungsspalte
+        value_col: zu summierende Spalte
+
+    Returns:
+        DataFrame mit Gruppierungs- und Wertspalte
+    """
+    return df.groupby(group_col, observed=True).agg({value_col: "sum"}).reset_index()
+
+
 def calculate_summary(df: pd.DataFrame) -> dict:
     """Berechnet Zusammenfassungsstatistiken für gefilterten DataFrame."""
-    besetzt = df[~df["Is_Vacant"]]
+    vacant = df["Is_Vacant"].to_numpy(dtype=bool)
+    besetzt = df[~vacant]
+    n_total = len(df)
+    n_besetzt = len(besetzt)
+
+    # Masken der besetzten Stellen nur einmal bilden, Anzahl und Quote daraus ableiten
+    counts = {"teilzeit": 0, "atz": 0, "female": 0}
+    avg_age = avg_tenure = 0
+    if n_besetzt > 0:
+        counts["teilzeit"] = (besetzt["Arbeitszeit"] == "Teilzeit").to_numpy().sum()
+        counts["atz"] = (besetzt["ATZ_Status"] != "Kein ATZ").to_numpy().sum()
+        counts["female"] = (besetzt["Geschlecht"] == "w").to_numpy().sum()
+        avg_age, avg_tenure = besetzt[["Alter", "Betriebszugehörigkeit_Jahre"]].mean()
+
+    vacancy_count = vacant.sum()
+    vacancy_rate = vacancy_count / n_total if n_total > 0 else np.nan
 
     return {
-        "total_planstellen": len(df),
-        "total_employees": besetzt["PersNr"].nunique() if "PersNr" in besetzt.columns else len(besetzt),
+        "total_planstellen": n_total,
+        "total_employees": besetzt["PersNr"].nunique() if "PersNr" in besetzt.columns else n_besetzt,
         "total_fte": df["FTE_assigned"].sum(),
         "total_soll_fte": df["Soll_FTE"].sum(),
         "total_cost": df["Total_Cost_Year"].sum(),
-        "vacancy_count": df["Is_Vacant"].sum(),
-        "vacancy_rate": df["Is_Vacant"].mean(),
-        "besetzungsgrad": 1 - df["Is_Vacant"].mean() if len(df) > 0 else 0,
-        "avg_age": besetzt["Alter"].mean() if len(besetzt) > 0 else 0,
-        "avg_tenure": besetzt["Betriebszugehörigkeit_Jahre"].mean() if len(besetzt) > 0 else 0,
-        "teilzeit_count": (besetzt["Arbeitszeit"] == "Teilzeit").sum() if len(besetzt) > 0 else 0,
-        "teilzeit_rate": (besetzt["Arbeitszeit"] == "Teilzeit").mean() if len(besetzt) > 0 else 0,
-        "atz_count": (besetzt["ATZ_Status"] != "Kein ATZ").sum() if len(besetzt) > 0 else 0,
-        "atz_rate": (besetzt["ATZ_Status"] != "Kein ATZ").mean() if len(besetzt) > 0 else 0,
-        "female_count": (besetzt["Geschlecht"] == "w").sum() if len(besetzt) > 0 else 0,
-        "female_rate": (besetzt["Geschlecht"] == "w").mean() if len(besetzt) > 0 else 0,
+        "vacancy_count": vacancy_count,
+        "vacancy_rate": vacancy_rate,
+        "besetzungsgrad": 1 - vacancy_rate if n_total > 0 else 0,
+        "avg_age": avg_age,
+        "avg_tenure": avg_tenure,
+        "teilzeit_count": counts["teilzeit"],
+        "teilzeit_rate": counts["teilzeit"] / n_besetzt if n_besetzt > 0 else 0,
+        "atz_count": counts["atz"],
+        "atz_rate": counts["atz"] / n_besetzt if n_besetzt > 0 else 0,
+        "female_count": counts["female"],
+        "female_rate": counts["female"] / n_besetzt if n_besetzt > 0 else 0,
     }
 
 
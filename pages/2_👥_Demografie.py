@@ -6,15 +6,18 @@ Analysen zu Alter, Geschlecht, Qualifikation und Arbeitszeit.
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 import sys
 import os
 
 # Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:  # Seiten laufen bei jedem Rerun erneut
+    sys.path.append(_ROOT)
 
 from data.loader import load_and_prepare_data
-from config.settings import format_percent, COLORS, COHORT_COLORS
+from config.settings import format_percent, COLORS, COHORT_COLORS, COLOR_SEQUENCE, EDUCATION_HIERARCHY
 from components.sidebar import render_global_filters, apply_filters, get_filter_summary
 from components.toggle import format_value
 from components.kpi_card import kpi_card, kpi_row
@@ -25,12 +28,21 @@ from components.charts import (
 from utils.ui_helpers import metric_info, section_header
 
 
+@st.cache_resource(show_spinner=False)
+def _custom_css() -> str:
+    """Liest das Custom CSS einmal pro Prozess als <style>-Block (leer, wenn die Datei fehlt)."""
+    css_path = os.path.join(_ROOT, "assets", "style.css")
+    if not os.path.exists(css_path):
+        return ""
+    with open(css_path) as f:
+        return f"<style>{f.read()}</style>"
+
+
 def load_custom_css():
     """Lädt Custom CSS."""
-    css_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "style.css")
-    if os.path.exists(css_path):
-        with open(css_path) as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+    css = _custom_css()
+    if css:
+        st.markdown(css, unsafe_allow_html=True)
 
 
 def main():
@@ -57,12 +69,15 @@ def main():
         st.divider()
 
         # Nur aktive Mitarbeitende (keine Vakanzen)
-        active_df = filtered_df[~filtered_df["Is_Vacant"]].copy()
+        active_df = filtered_df[~filtered_df["Is_Vacant"]]
 
         if len(active_df) == 0:
             st.warning("Keine Daten für die aktuellen Filter verfügbar.")
             return
 
+        # Aggregate aller Tabs einmal pro Rerun
+        aggs = _demographics_aggs(active_df, view_mode)
+
         # Tabs
         tab1, tab2, tab3, tab4 = st.tabs([
             "📊 Alter",
@@ -75,25 +90,25 @@ def main():
         # TAB 1: ALTER
         # =====================================================================
         with tab1:
-            render_age_tab(active_df, view_mode)
+            render_age_tab(active_df, view_mode, aggs)
 
         # =====================================================================
         # TAB 2: GESCHLECHT
         # =====================================================================
         with tab2:
-            render_gender_tab(active_df, view_mode)
+            render_gender_tab(active_df, view_mode, aggs)
 
         # =====================================================================
         # TAB 3: QUALIFIKATION
         # =====================================================================
         with tab3:
-            render_education_tab(active_df, view_mode)
+            render_education_tab(active_df, view_mode, aggs)
 
         # =====================================================================
         # TAB 4: ARBEITSZEIT
         # =====================================================================
         with tab4:
-            render_worktime_tab(active_df, view_mode)
+            render_worktime_tab(active_df, view_mode, aggs)
 
     except FileNotFoundError:
         st.error("❌ Testdaten nicht gefunden! Bitte generiere zuerst die Testdaten.")
@@ -103,7 +118,230 @@ def main():
         st.code(traceback.format_exc())
 
 
-def render_age_tab(df: pd.DataFrame, view_mode: str):
+# =============================================================================
+# CHART-LAYOUT
+# =============================================================================
+
+# Gemeinsame Layout-Teile der Charts (einmalig beim Import aufgebaut);
+# chartspezifische Angaben werden per update_layout darübergelegt
+_BASE_LAYOUT = dict(
+    plot_bgcolor="rgba(0,0,0,0)",
+    paper_bgcolor="rgba(0,0,0,0)",
+    font=dict(color=COLORS["text_primary"]),
+)
+
+_AXES_LAYOUT = dict(
+    _BASE_LAYOUT,
+    margin=dict(l=60, r=40, t=90, b=60),
+    xaxis=dict(gridcolor=COLORS["card_border"]),
+    yaxis=dict(gridcolor=COLORS["card_border"]),
+    legend=dict(
+        orientation="h",
+        yanchor="bottom",
+        y=1.02,
+        xanchor="center",
+        x=0.5,
+        bgcolor="#FFFFFF",
+        bordercolor="rgba(0,0,0,0)",
+        borderwidth=0
+    ),
+)
+
+
+# =============================================================================
+# GECACHTE AGGREGATIONEN
+# =============================================================================
+
+def _category_counts(series: pd.Series) -> dict:
+    """
+    Zählt die Werte je Ausprägung in einem Durchlauf über die Kategorie-Codes.
+
+    Args:
+        series: Spalte (wird bei Bedarf in category umgewandelt)
+
+    Returns:
+        Dictionary Ausprägung -> Anzahl (fehlende Werte zählen nicht)
+    """
+    series = series.astype("category")
+    codes = series.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+    return dict(zip(series.cat.categories, counts))
+
+
+def _cohort_crosstab(df: pd.DataFrame, col: str) -> pd.DataFrame:
+    """
+    Zählt Personen je (Alterskohorte, Merkmal) über die Kategorie-Codes.
+
+    Ein np.bincount über den kombinierten Code beider Spalten ersetzt
+    groupby(["Alterskohorte", col], observed=True).size(): gleiche Zeilen
+    (nur vorkommende Kombinationen, in Kategorie-Reihenfolge), fehlende
+    Werte entfallen.
+
+    Args:
+        df: DataFrame mit Spalte "Alterskohorte"
+        col: Zweites Merkmal (z.B. "Geschlecht")
+
+    Returns:
+        DataFrame mit Spalten "Alterskohorte", col und "Anzahl"
+    """
+    cohort = df["Alterskohorte"].astype("category")
+    other = df[col].astype("category")
+    cohort_codes = cohort.cat.codes.to_numpy()
+    other_codes = other.cat.codes.to_numpy()
+    n_other = len(other.cat.categories)
+
+    valid = (cohort_codes >= 0) & (other_codes >= 0)
+    combined = cohort_codes[valid].astype(np.intp) * n_other + other_codes[valid]
+    counts = np.bincount(combined, minlength=len(cohort.cat.categories) * n_other)
+    observed = np.flatnonzero(counts)
+
+    return pd.DataFrame({
+        "Alterskohorte": pd.Categorical.from_codes(observed // n_other, dtype=cohort.dtype),
+        col: pd.Categorical.from_codes(observed % n_other, dtype=other.dtype),
+        "Anzahl": counts[observed],
+    })
+
+
+def _average_education_level(series: pd.Series) -> float:
+    """
+    Mittleres Qualifikationslevel laut EDUCATION_HIERARCHY.
+
+    Das Level wird einmal je Kategorie nachgeschlagen und per Code auf die
+    Zeilen verteilt; unbekannte oder fehlende Qualifikationen zählen nicht.
+
+    Args:
+        series: Spalte "Ausbildung"
+
+    Returns:
+        Mittleres Level (NaN, wenn kein Level bekannt ist)
+    """
+    series = series.astype("category")
+    # Angehängtes NaN: Code -1 (fehlender Wert) greift auf das letzte Element
+    level_lut = np.array(
+        [EDUCATION_HIERARCHY.get(category, np.nan) for category in series.cat.categories] + [np.nan],
+        dtype=np.float64
+    )
+    levels = level_lut[series.cat.codes.to_numpy()]
+    known = levels[~np.isnan(levels)]
+    return known.mean() if len(known) else np.nan
+
+
+def _count_matching(series: pd.Series, pattern: str) -> int:
+    """
+    Zählt die Werte einer Textspalte, die auf ein Regex-Muster passen.
+
+    Bei category-Spalten läuft das Muster nur über die wenigen Kategorien
+    statt über jede Zeile.
+
+    Args:
+        series: Textspalte (z.B. "Ausbildung")
+        pattern: Regex-Muster (Groß-/Kleinschreibung egal)
+
+    Returns:
+        Anzahl passender Werte (fehlende Werte zählen nicht)
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        matching = categories[categories.str.contains(pattern, case=False)]
+        return int(series.isin(matching).sum())
+    return int(series.str.contains(pattern, case=False, na=False).sum())
+
+
+def _demographics_aggs(df: pd.DataFrame, view_mode: str) -> dict:
+    """
+    Berechnet die Aggregate aller Demografie-Tabs für einen Filterzustand.
+
+    Args:
+        df: Aktive Mitarbeitende (gefiltert, ohne Vakanzen)
+        view_mode: "MAK" oder "Euro"
+
+    Returns:
+        Dictionary mit den Aggregat-DataFrames der Tabs und den nach
+        Häufigkeit sortierten Qualifikationen ("top_edu")
+    """
+    value_col = "FTE_assigned" if view_mode == "MAK" else "Total_Cost_Year"
+
+    # Kohorten-Tabelle (Alter-Tab)
+    cohort = df.groupby("Alterskohorte", observed=True).agg({
+        "PersNr": "count",
+        "FTE_assigned": "sum",
+        "Total_Cost_Year": "sum",
+        "Alter": "mean"
+    }).reset_index()
+    cohort.columns = ["Kohorte", "Anzahl", "FTE", "Kosten", "Ø Alter"]
+
+    # Häufigste Qualifikationen (Top 5/6/8 sind Präfixe derselben Rangfolge)
+    top_edu = df["Ausbildung"].value_counts().head(8).index.tolist()
+    cohort_edu_all = _cohort_crosstab(df, "Ausbildung")
+
+    def cohort_edu(n: int) -> pd.DataFrame:
+        top = cohort_edu_all[cohort_edu_all["Ausbildung"].isin(top_edu[:n])]
+        return top.reset_index(drop=True)
+
+    # Summe der Wertspalte je Ausprägung (Donuts)
+    def value_sum(col: str) -> pd.DataFrame:
+        dist = df.groupby(col, observed=True).agg({value_col: "sum"}).reset_index()
+        dist.columns = [col, "Wert"]
+        return dist
+
+    edu_treemap = df.groupby("Ausbildung", observed=True).agg({
+        value_col: "sum",
+        "PersNr": "count"
+    }).reset_index()
+    edu_treemap.columns = ["Qualifikation", "Wert", "Anzahl"]
+
+    return {
+        "cohort": cohort,
+        "akademiker": _count_matching(df["Ausbildung"], "Bachelor|Master"),
+        "azubis": _count_matching(df["Ausbildung"], "Berufsausbildung"),
+        "avg_education_level": _average_education_level(df["Ausbildung"]),
+        "cohort_gender": _cohort_crosstab(df, "Geschlecht"),
+        "top_edu": top_edu,
+        "cohort_edu_top5": cohort_edu(5),
+        "cohort_edu_top6": cohort_edu(6),
+        "gender_dist": value_sum("Geschlecht"),
+        "edu_treemap": edu_treemap,
+        "worktime_dist": value_sum("Arbeitszeit"),
+        "work_cohort": _cohort_crosstab(df, "Arbeitszeit"),
+    }
+
+
+# =============================================================================
+# GECACHTE CHARTS
+# =============================================================================
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _education_treemap(edu_agg: pd.DataFrame) -> go.Figure:
+    """
+    Baut die Qualifikations-Treemap.
+
+    Gecacht auf dem aggregierten DataFrame: bei unveränderten Filtern wird
+    die fertige Figure wiederverwendet statt neu aufgebaut und validiert.
+
+    Args:
+        edu_agg: DataFrame mit Spalten "Qualifikation", "Wert" und "Anzahl"
+
+    Returns:
+        Plotly Figure
+    """
+    fig = go.Figure(go.Treemap(
+        labels=edu_agg["Qualifikation"],
+        parents=[""] * len(edu_agg),
+        values=edu_agg["Wert"],
+        text=np.char.add(edu_agg["Anzahl"].to_numpy().astype(str), " MA"),
+        textposition="middle center",
+        marker=dict(
+            colorscale="Teal",
+            line=dict(color=COLORS["background"], width=2)
+        ),
+        hovertemplate="<b>%{label}</b><br>Anzahl: %{text}<br>Wert: %{value:,.0f}<extra></extra>"
+    ))
+
+    fig.update_layout(_BASE_LAYOUT, height=400)
+    return fig
+
+
+def render_age_tab(df: pd.DataFrame, view_mode: str, aggs: dict):
     """Rendert den Alter-Tab mit Population Pyramid und Kohorten-Analyse."""
 
     section_header(
@@ -118,20 +356,21 @@ def render_age_tab(df: pd.DataFrame, view_mode: str):
         "Hohe Anteile bei 55+ Jahren signalisieren Ruhestandswellen, niedrige Anteile unter 30 Jahren deuten auf Nachwuchsprobleme hin."
     )
 
-    # KPIs
+    # KPIs (Alter einmal als Array holen, alle Kennzahlen daraus)
+    ages = df["Alter"].to_numpy()
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        avg_age = df["Alter"].mean()
+        avg_age = ages.mean()
         kpi_card(
             title="Durchschnittsalter",
             value=f"{avg_age:.1f} Jahre",
-            subtitle=f"Median: {df['Alter'].median():.0f} Jahre",
+            subtitle=f"Median: {np.median(ages):.0f} Jahre",
             icon="👤"
         )
 
     with col2:
-        age_55plus = (df["Alter"] >= 55).sum()
+        age_55plus = (ages >= 55).sum()
         age_55plus_rate = age_55plus / len(df)
         status = "warning" if age_55plus_rate > 0.35 else "good"
         kpi_card(
@@ -143,7 +382,7 @@ def render_age_tab(df: pd.DataFrame, view_mode: str):
         )
 
     with col3:
-        age_under_30 = (df["Alter"] < 30).sum()
+        age_under_30 = (ages < 30).sum()
         age_under_30_rate = age_under_30 / len(df)
         kpi_card(
             title="Unter 30 Jahre",
@@ -171,35 +410,25 @@ def render_age_tab(df: pd.DataFrame, view_mode: str):
         value_col=value_col,
         title=""
     )
-    st.plotly_chart(fig_pyramid, use_container_width=True)
+    st.plotly_chart(fig_pyramid, use_container_width=True, key="demografie_pyramid")
 
     # Kohorten-Analyse
     st.markdown("#### Verteilung nach Alterskohorten")
 
-    cohort_data = df.groupby("Alterskohorte").agg({
-        "PersNr": "count",
-        "FTE_assigned": "sum",
-        "Total_Cost_Year": "sum",
-        "Alter": "mean"
-    }).reset_index()
-    cohort_data.columns = ["Kohorte", "Anzahl", "FTE", "Kosten", "Ø Alter"]
-
-    # Sortiere nach Altersgruppen-Logik
-    cohort_order = list(st.session_state.get("cohort_definitions", {}).keys())
-    cohort_data["sort_key"] = cohort_data["Kohorte"].apply(
-        lambda x: cohort_order.index(x) if x in cohort_order else 999
-    )
-    cohort_data = cohort_data.sort_values("sort_key").drop("sort_key", axis=1)
+    # Bereits in Kohorten-Reihenfolge: die Kategorien der Alterskohorte folgen
+    # der Definitionsreihenfolge, "Unbekannt" zuletzt
+    cohort_data = aggs["cohort"]
 
     # Berechne Anteile
     cohort_data["Anteil"] = cohort_data["Anzahl"] / cohort_data["Anzahl"].sum()
 
-    # Formatiere Tabelle
+    # Formatiere Tabelle (spaltenweise; Anteile <= 100 % brauchen keine Tausenderpunkte)
     cohort_display = cohort_data.copy()
-    cohort_display["Anteil"] = cohort_display["Anteil"].apply(lambda x: format_percent(x))
-    cohort_display["FTE"] = cohort_display["FTE"].apply(lambda x: f"{x:.1f}")
-    cohort_display["Kosten"] = cohort_display["Kosten"].apply(lambda x: format_value(x, "Euro"))
-    cohort_display["Ø Alter"] = cohort_display["Ø Alter"].apply(lambda x: f"{x:.1f}")
+    anteil_text = np.char.mod("%.1f", cohort_data["Anteil"].to_numpy(dtype=np.float64) * 100)
+    cohort_display["Anteil"] = np.char.add(np.char.replace(anteil_text, ".", ","), "%")
+    cohort_display["FTE"] = np.char.mod("%.1f", cohort_data["FTE"].to_numpy(dtype=np.float64))
+    cohort_display["Kosten"] = [format_value(x, "Euro") for x in cohort_data["Kosten"].to_numpy()]
+    cohort_display["Ø Alter"] = np.char.mod("%.1f", cohort_data["Ø Alter"].to_numpy(dtype=np.float64))
 
     st.dataframe(
         cohort_display,
@@ -213,7 +442,7 @@ def render_age_tab(df: pd.DataFrame, view_mode: str):
     with col1:
         # Stacked Bar: Kohorte × Geschlecht
         st.markdown("##### Kohorten nach Geschlecht")
-        cohort_gender = df.groupby(["Alterskohorte", "Geschlecht"]).size().reset_index(name="Anzahl")
+        cohort_gender = aggs["cohort_gender"]
 
         fig = go.Figure()
         for gender in ["m", "w"]:
@@ -225,42 +454,20 @@ def render_age_tab(df: pd.DataFrame, view_mode: str):
                 marker_color=COLORS["gender_male"] if gender == "m" else COLORS["gender_female"]
             ))
 
-        fig.update_layout(
-            barmode="stack",
-            plot_bgcolor="rgba(0,0,0,0)",
-            paper_bgcolor="rgba(0,0,0,0)",
-            font=dict(color=COLORS["text_primary"]),
-            height=350,
-            margin=dict(l=60, r=40, t=90, b=60),
-            xaxis=dict(gridcolor=COLORS["card_border"]),
-            yaxis=dict(gridcolor=COLORS["card_border"]),
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="center",
-                x=0.5,
-                bgcolor="#FFFFFF",
-                bordercolor="rgba(0,0,0,0)",
-                borderwidth=0
-            )
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        fig.update_layout(_AXES_LAYOUT, barmode="stack", height=350)
+        st.plotly_chart(fig, use_container_width=True, key="demografie_cohort_gender")
 
     with col2:
         # Qualifikation × Alter - Stacked Bar
         st.markdown("##### Top Qualifikationen nach Kohorte")
 
         # Top 5 Qualifikationen
-        top_edu = df["Ausbildung"].value_counts().head(5).index.tolist()
-        qual_age_data = df[df["Ausbildung"].isin(top_edu)]
-
-        qual_cohort = qual_age_data.groupby(["Alterskohorte", "Ausbildung"]).size().reset_index(name="Anzahl")
+        top_edu = aggs["top_edu"][:5]
+        qual_cohort = aggs["cohort_edu_top5"]
 
         fig2 = go.Figure()
         for i, edu in enumerate(top_edu):
             edu_data = qual_cohort[qual_cohort["Ausbildung"] == edu]
-            from config.settings import COLOR_SEQUENCE
             fig2.add_trace(go.Bar(
                 x=edu_data["Alterskohorte"],
                 y=edu_data["Anzahl"],
@@ -268,36 +475,17 @@ def render_age_tab(df: pd.DataFrame, view_mode: str):
                 marker_color=COLOR_SEQUENCE[i % len(COLOR_SEQUENCE)]
             ))
 
-        fig2.update_layout(
-            barmode="stack",
-            plot_bgcolor="rgba(0,0,0,0)",
-            paper_bgcolor="rgba(0,0,0,0)",
-            font=dict(color=COLORS["text_primary"]),
-            height=350,
-            margin=dict(l=60, r=40, t=90, b=60),
-            xaxis=dict(gridcolor=COLORS["card_border"]),
-            yaxis=dict(gridcolor=COLORS["card_border"]),
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="center",
-                x=0.5,
-                bgcolor="#FFFFFF",
-                bordercolor="rgba(0,0,0,0)",
-                borderwidth=0
-            )
-        )
-        st.plotly_chart(fig2, use_container_width=True)
+        fig2.update_layout(_AXES_LAYOUT, barmode="stack", height=350)
+        st.plotly_chart(fig2, use_container_width=True, key="demografie_cohort_education")
 
 
-def render_gender_tab(df: pd.DataFrame, view_mode: str):
+def render_gender_tab(df: pd.DataFrame, view_mode: str, aggs: dict):
     """Rendert den Geschlecht-Tab."""
 
     st.markdown("### ⚧ Geschlechterverteilung")
 
     # KPIs
-    gender_counts = df["Geschlecht"].value_counts()
+    gender_counts = _category_counts(df["Geschlecht"])
     female_count = gender_counts.get("w", 0)
     male_count = gender_counts.get("m", 0)
     total = len(df)
@@ -343,10 +531,7 @@ def render_gender_tab(df: pd.DataFrame, view_mode: str):
     with col1:
         # Donut Chart
         st.markdown("#### Gesamtverteilung")
-        gender_dist = df.groupby("Geschlecht").agg({
-            "FTE_assigned" if view_mode == "MAK" else "Total_Cost_Year": "sum"
-        }).reset_index()
-        gender_dist.columns = ["Geschlecht", "Wert"]
+        gender_dist = aggs["gender_dist"]
         gender_dist["Geschlecht"] = gender_dist["Geschlecht"].map({"m": "Männlich", "w": "Weiblich"})
 
         fig_gender = create_donut_chart(
@@ -355,13 +540,13 @@ def render_gender_tab(df: pd.DataFrame, view_mode: str):
             names_col="Geschlecht",
             colors=[COLORS["gender_male"], COLORS["gender_female"]]
         )
-        st.plotly_chart(fig_gender, use_container_width=True)
+        st.plotly_chart(fig_gender, use_container_width=True, key="demografie_gender")
 
     with col2:
         # Grouped Bar: Geschlecht × Kohorte
         st.markdown("#### Geschlecht nach Alterskohorte")
 
-        cohort_gender = df.groupby(["Alterskohorte", "Geschlecht"]).size().reset_index(name="Anzahl")
+        cohort_gender = aggs["cohort_gender"]
 
         fig = go.Figure()
         for gender in ["w", "m"]:
@@ -373,33 +558,14 @@ def render_gender_tab(df: pd.DataFrame, view_mode: str):
                 marker_color=COLORS["gender_female"] if gender == "w" else COLORS["gender_male"]
             ))
 
-        fig.update_layout(
-            barmode="group",
-            plot_bgcolor="rgba(0,0,0,0)",
-            paper_bgcolor="rgba(0,0,0,0)",
-            font=dict(color=COLORS["text_primary"]),
-            height=350,
-            margin=dict(l=60, r=40, t=90, b=60),
-            xaxis=dict(gridcolor=COLORS["card_border"]),
-            yaxis=dict(gridcolor=COLORS["card_border"]),
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="center",
-                x=0.5,
-                bgcolor="#FFFFFF",
-                bordercolor="rgba(0,0,0,0)",
-                borderwidth=0
-            )
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        fig.update_layout(_AXES_LAYOUT, barmode="group", height=350)
+        st.plotly_chart(fig, use_container_width=True, key="demografie_gender_cohort")
 
     # Heatmap: Geschlecht × Ausbildung
     st.markdown("#### Geschlecht nach Qualifikation")
 
     # Top 8 Qualifikationen
-    top_edu = df["Ausbildung"].value_counts().head(8).index.tolist()
+    top_edu = aggs["top_edu"][:8]
     heatmap_data = df[df["Ausbildung"].isin(top_edu)]
 
     fig_heat = create_heatmap(
@@ -408,20 +574,20 @@ def render_gender_tab(df: pd.DataFrame, view_mode: str):
         y_col="Ausbildung",
         value_col="PersNr"
     )
-    st.plotly_chart(fig_heat, use_container_width=True)
+    st.plotly_chart(fig_heat, use_container_width=True, key="demografie_gender_education")
 
 
-def render_education_tab(df: pd.DataFrame, view_mode: str):
+def render_education_tab(df: pd.DataFrame, view_mode: str, aggs: dict):
     """Rendert den Qualifikations-Tab."""
 
     st.markdown("### 🎓 Qualifikationsstruktur")
 
     # KPIs
     total = len(df)
-    akademiker = df[df["Ausbildung"].str.contains("Bachelor|Master", case=False, na=False)].shape[0]
+    akademiker = aggs["akademiker"]
     akademiker_rate = akademiker / total if total > 0 else 0
 
-    azubis = df[df["Ausbildung"].str.contains("Berufsausbildung", case=False, na=False)].shape[0]
+    azubis = aggs["azubis"]
     azubis_rate = azubis / total if total > 0 else 0
 
     col1, col2, col3 = st.columns(3)
@@ -445,8 +611,7 @@ def render_education_tab(df: pd.DataFrame, view_mode: str):
 
     with col3:
         # Durchschnittliche Qualifikation (basierend auf Hierarchy)
-        from config.settings import EDUCATION_HIERARCHY
-        avg_level = df["Ausbildung"].map(EDUCATION_HIERARCHY).mean()
+        avg_level = aggs["avg_education_level"]
         kpi_card(
             title="Ø Qualifikationslevel",
             value=f"{avg_level:.1f}",
@@ -459,45 +624,17 @@ def render_education_tab(df: pd.DataFrame, view_mode: str):
     # Treemap
     st.markdown("#### Qualifikationsverteilung (Treemap)")
 
-    value_col = "FTE_assigned" if view_mode == "MAK" else "Total_Cost_Year"
-    edu_agg = df.groupby("Ausbildung").agg({
-        value_col: "sum",
-        "PersNr": "count"
-    }).reset_index()
-    edu_agg.columns = ["Qualifikation", "Wert", "Anzahl"]
-
-    fig = go.Figure(go.Treemap(
-        labels=edu_agg["Qualifikation"],
-        parents=[""] * len(edu_agg),
-        values=edu_agg["Wert"],
-        text=edu_agg["Anzahl"].apply(lambda x: f"{x} MA"),
-        textposition="middle center",
-        marker=dict(
-            colorscale="Teal",
-            line=dict(color=COLORS["background"], width=2)
-        ),
-        hovertemplate="<b>%{label}</b><br>Anzahl: %{text}<br>Wert: %{value:,.0f}<extra></extra>"
-    ))
-
-    fig.update_layout(
-        plot_bgcolor="rgba(0,0,0,0)",
-        paper_bgcolor="rgba(0,0,0,0)",
-        font=dict(color=COLORS["text_primary"]),
-        height=400
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    fig = _education_treemap(aggs["edu_treemap"])
+    st.plotly_chart(fig, use_container_width=True, key="demografie_education_treemap")
 
     # Stacked Bar: Qualifikation × Alter
     st.markdown("#### Qualifikation nach Alterskohorte")
 
     # Top 6 Qualifikationen
-    top_edu = df["Ausbildung"].value_counts().head(6).index.tolist()
-    qual_cohort_data = df[df["Ausbildung"].isin(top_edu)]
-
-    qual_cohort = qual_cohort_data.groupby(["Alterskohorte", "Ausbildung"]).size().reset_index(name="Anzahl")
+    top_edu = aggs["top_edu"][:6]
+    qual_cohort = aggs["cohort_edu_top6"]
 
     fig2 = go.Figure()
-    from config.settings import COLOR_SEQUENCE
     for i, edu in enumerate(top_edu):
         edu_data = qual_cohort[qual_cohort["Ausbildung"] == edu]
         fig2.add_trace(go.Bar(
@@ -509,36 +646,23 @@ def render_education_tab(df: pd.DataFrame, view_mode: str):
         ))
 
     fig2.update_layout(
+        _AXES_LAYOUT,
         barmode="stack",
-        plot_bgcolor="rgba(0,0,0,0)",
-        paper_bgcolor="rgba(0,0,0,0)",
-        font=dict(color=COLORS["text_primary"]),
         height=400,
-        margin=dict(l=60, r=40, t=90, b=60),
-        xaxis=dict(gridcolor=COLORS["card_border"]),
-        yaxis=dict(gridcolor=COLORS["card_border"], autorange="reversed"),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="center",
-            x=0.5,
-            bgcolor="#FFFFFF",
-            bordercolor="rgba(0,0,0,0)",
-            borderwidth=0
-        )
+        yaxis=dict(autorange="reversed")
     )
-    st.plotly_chart(fig2, use_container_width=True)
+    st.plotly_chart(fig2, use_container_width=True, key="demografie_education_cohort")
 
 
-def render_worktime_tab(df: pd.DataFrame, view_mode: str):
+def render_worktime_tab(df: pd.DataFrame, view_mode: str, aggs: dict):
     """Rendert den Arbeitszeit-Tab."""
 
     st.markdown("### ⏰ Arbeitszeitmodelle")
 
     # KPIs
-    vz_count = (df["Arbeitszeit"] == "Vollzeit").sum()
-    tz_count = (df["Arbeitszeit"] == "Teilzeit").sum()
+    worktime_counts = _category_counts(df["Arbeitszeit"])
+    vz_count = worktime_counts.get("Vollzeit", 0)
+    tz_count = worktime_counts.get("Teilzeit", 0)
     total = len(df)
 
     vz_rate = vz_count / total if total > 0 else 0
@@ -581,23 +705,20 @@ def render_worktime_tab(df: pd.DataFrame, view_mode: str):
         # Donut VZ/TZ
         st.markdown("#### Vollzeit vs. Teilzeit")
 
-        vz_tz_dist = df.groupby("Arbeitszeit").agg({
-            "FTE_assigned" if view_mode == "MAK" else "Total_Cost_Year": "sum"
-        }).reset_index()
-        vz_tz_dist.columns = ["Arbeitszeit", "Wert"]
+        vz_tz_dist = aggs["worktime_dist"]
 
         fig_vz_tz = create_donut_chart(
             vz_tz_dist,
             values_col="Wert",
             names_col="Arbeitszeit"
         )
-        st.plotly_chart(fig_vz_tz, use_container_width=True)
+        st.plotly_chart(fig_vz_tz, use_container_width=True, key="demografie_worktime")
 
     with col2:
         # Grouped Bar: Arbeitszeit nach Kohorte
         st.markdown("#### Arbeitszeit nach Alterskohorte")
 
-        work_cohort = df.groupby(["Alterskohorte", "Arbeitszeit"]).size().reset_index(name="Anzahl")
+        work_cohort = aggs["work_cohort"]
 
         fig = go.Figure()
         for work_type in ["Vollzeit", "Teilzeit"]:
@@ -609,39 +730,25 @@ def render_worktime_tab(df: pd.DataFrame, view_mode: str):
                 marker_color=COLORS["accent_teal"] if work_type == "Vollzeit" else COLORS["accent_amber"]
             ))
 
-        fig.update_layout(
-            barmode="group",
-            plot_bgcolor="rgba(0,0,0,0)",
-            paper_bgcolor="rgba(0,0,0,0)",
-            font=dict(color=COLORS["text_primary"]),
-            height=350,
-            margin=dict(l=60, r=40, t=90, b=60),
-            xaxis=dict(gridcolor=COLORS["card_border"]),
-            yaxis=dict(gridcolor=COLORS["card_border"]),
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="center",
-                x=0.5,
-                bgcolor="#FFFFFF",
-                bordercolor="rgba(0,0,0,0)",
-                borderwidth=0
-            )
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        fig.update_layout(_AXES_LAYOUT, barmode="group", height=350)
+        st.plotly_chart(fig, use_container_width=True, key="demografie_worktime_cohort")
 
     # Scatter: Alter vs. Beschäftigungsgrad
     st.markdown("#### Beschäftigungsgrad nach Alter")
 
     fig_scatter = go.Figure()
 
-    # Scatter für Männer und Frauen getrennt
+    # Scatter für Männer und Frauen getrennt (eigene Legendeneinträge); ein
+    # Marker je Person, daher WebGL statt eines SVG-Knotens pro Punkt.
+    # Spalten einmal als Arrays holen und je Geschlecht nur per Maske schneiden
+    genders = df["Geschlecht"].to_numpy()
+    ages = df["Alter"].to_numpy()
+    fte_percent = df["FTE_person"].to_numpy() * 100
     for gender, color in [("w", COLORS["gender_female"]), ("m", COLORS["gender_male"])]:
-        gender_data = df[df["Geschlecht"] == gender]
-        fig_scatter.add_trace(go.Scatter(
-            x=gender_data["Alter"],
-            y=gender_data["FTE_person"] * 100,
+        is_gender = genders == gender
+        fig_scatter.add_trace(go.Scattergl(
+            x=ages[is_gender],
+            y=fte_percent[is_gender],
             mode="markers",
             name="Weiblich" if gender == "w" else "Männlich",
             marker=dict(
@@ -654,32 +761,13 @@ def render_worktime_tab(df: pd.DataFrame, view_mode: str):
         ))
 
     fig_scatter.update_layout(
-        plot_bgcolor="rgba(0,0,0,0)",
-        paper_bgcolor="rgba(0,0,0,0)",
-        font=dict(color=COLORS["text_primary"]),
+        _AXES_LAYOUT,
         height=400,
-        margin=dict(l=60, r=40, t=90, b=60),
-        xaxis=dict(
-            title="Alter (Jahre)",
-            gridcolor=COLORS["card_border"]
-        ),
-        yaxis=dict(
-            title="Beschäftigungsgrad (%)",
-            gridcolor=COLORS["card_border"]
-        ),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="center",
-            x=0.5,
-            bgcolor="#FFFFFF",
-            bordercolor="rgba(0,0,0,0)",
-            borderwidth=0
-        ),
+        xaxis=dict(title="Alter (Jahre)"),
+        yaxis=dict(title="Beschäftigungsgrad (%)"),
         hovermode="closest"
     )
-    st.plotly_chart(fig_scatter, use_container_width=True)
+    st.plotly_chart(fig_scatter, use_container_width=True, key="demografie_worktime_scatter")
 
 
 if __name__ == "__main__":
@@ -12,7 +12,9 @@ import os
 from datetime import datetime, timedelta
 
 # Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:  # Seiten laufen bei jedem Rerun erneut
+    sys.path.append(_ROOT)
 
 from data.loader import load_and_prepare_data
 from config.settings import format_number, format_currency, format_percent, get_status_color, THRESHOLDS
@@ -25,6 +27,10 @@ from components.charts import (
 )
 from utils.ui_helpers import metric_info, section_header
 
+# Obergrenze der Gantt-Balken (je Person zwei: Arbeits- und Freistellungsphase);
+# hält die Timeline lesbar und das an Plotly gesendete Payload konstant klein
+MAX_GANTT_BARS = 40
+
 
 def load_custom_css():
     """Lädt Custom CSS."""
@@ -42,39 +48,67 @@ def calculate_atz_end_dates(df: pd.DataFrame) -> pd.DataFrame:
     - ATZ läuft bis Renteneintritt mit 67
     - Arbeitsphase und Freistellungsphase sind gleich lang
     """
-    df = df.copy()
-
-    # Nur ATZ-Mitarbeitende
-    atz_df = df[df["ATZ_Status"] != "Kein ATZ"].copy()
+    # Nur ATZ-Mitarbeitende (Maske liefert bereits einen neuen Frame, kein copy nötig)
+    atz_df = df[df["ATZ_Status"] != "Kein ATZ"]
 
     if len(atz_df) == 0:
         return pd.DataFrame()
 
     # Berechne Renteneintritt (67 Jahre)
-    atz_df["Renteneintritt"] = pd.to_datetime(atz_df["GebDatum"]) + pd.DateOffset(years=67)
+    renteneintritt = pd.to_datetime(atz_df["GebDatum"]) + pd.DateOffset(years=67)
 
     # Berechne ATZ-Start (geschätzt 5 Jahre vor Renteneintritt)
-    atz_df["ATZ_Start"] = atz_df["Renteneintritt"] - pd.DateOffset(years=5)
+    atz_start = renteneintritt - pd.DateOffset(years=5)
 
     # Berechne Phasenende (Mitte zwischen Start und Renteneintritt)
-    atz_df["Phasen_Wechsel"] = atz_df["ATZ_Start"] + (atz_df["Renteneintritt"] - atz_df["ATZ_Start"]) / 2
+    phasen_wechsel = atz_start + (renteneintritt - atz_start) / 2
 
-    return atz_df
+    return atz_df.assign(
+        Renteneintritt=renteneintritt,
+        ATZ_Start=atz_start,
+        Phasen_Wechsel=phasen_wechsel,
+    )
 
 
-def render_funnel_section(df: pd.DataFrame):
-    """Rendert den ATZ-Funnel."""
-    st.markdown("#### 📊 ATZ-Funnel: Vom Gesamtbestand zur Freistellungsphase")
+def _percent(part: float, whole: float) -> float:
+    """Anteil part/whole in Prozent (0.0 bei whole == 0)."""
+    return part / whole * 100 if whole else 0.0
 
-    # Nur besetzte Stellen
-    active_df = df[~df["Is_Vacant"]]
+
+def calculate_atz_counts(active_df: pd.DataFrame) -> dict:
+    """
+    Zählt die ATZ-Funnel-Stufen der besetzten Stellen.
+
+    Ein value_counts über ATZ_Status ersetzt die einzelnen Vergleiche je Phase.
+
+    Args:
+        active_df: Besetzte Stellen (ohne Vakanzen)
+
+    Returns:
+        Dictionary mit total, berechtigt (55+), in_atz, arbeitsphase, freistellung
+    """
+    status_counts = active_df["ATZ_Status"].value_counts()
+    total = len(active_df)
+    return {
+        "total": total,
+        "berechtigt": int((active_df["Alter"].to_numpy() >= 55).sum()),  # 55+ berechtigt
+        # Alles außer "Kein ATZ" (wie ATZ_Status != "Kein ATZ")
+        "in_atz": total - int(status_counts.get("Kein ATZ", 0)),
+        "arbeitsphase": int(status_counts.get("Arbeitsphase", 0)),
+        "freistellung": int(status_counts.get("Freistellungsphase", 0)),
+    }
+
+
+def render_funnel_section(counts: dict):
+    """Rendert den ATZ-Funnel aus den Zählungen von calculate_atz_counts."""
+    st.markdown("#### 📊 ATZ-Funnel: Vom Gesamtbestand zur Freistellungsphase")
 
     # Funnel-Stufen
-    total_employees = len(active_df)
-    atz_berechtigt = len(active_df[active_df["Alter"] >= 55])  # 55+ berechtigt
-    in_atz = len(active_df[active_df["ATZ_Status"] != "Kein ATZ"])
-    arbeitsphase = len(active_df[active_df["ATZ_Status"] == "Arbeitsphase"])
-    freistellung = len(active_df[active_df["ATZ_Status"] == "Freistellungsphase"])
+    total_employees = counts["total"]
+    atz_berechtigt = counts["berechtigt"]
+    in_atz = counts["in_atz"]
+    arbeitsphase = counts["arbeitsphase"]
+    freistellung = counts["freistellung"]
 
     stages = [
         "Gesamtbelegschaft",
@@ -92,7 +126,7 @@ def render_funnel_section(df: pd.DataFrame):
         title=""
     )
 
-    st.plotly_chart(fig_funnel, use_container_width=True)
+    st.plotly_chart(fig_funnel, use_container_width=True, key="atz_funnel")
 
     # Konversionsraten
     col1, col2, col3 = st.columns(3)
@@ -125,42 +159,36 @@ def render_funnel_section(df: pd.DataFrame):
             )
 
 
-def render_timeline_section(df: pd.DataFrame):
-    """Rendert Gantt-Timeline der ATZ-Verläufe."""
+def render_timeline_section(atz_timeline: pd.DataFrame):
+    """Rendert Gantt-Timeline der ATZ-Verläufe (atz_timeline aus calculate_atz_end_dates)."""
     st.markdown("#### 📅 ATZ-Timeline: Phasenübergänge")
 
-    atz_timeline = calculate_atz_end_dates(df)
-
     if len(atz_timeline) == 0:
         st.info("Keine ATZ-Mitarbeitenden im ausgewählten Bereich.")
         return
 
-    # Top 20 für bessere Lesbarkeit
-    atz_timeline = atz_timeline.nlargest(20, "Alter")
-
-    # Erstelle Gantt-Daten
-    gantt_data = []
-
-    for _, row in atz_timeline.iterrows():
-        name = f"{row.get('Vorname', 'N/A')} {row.get('Nachname', 'N/A')} ({int(row['Alter'])})"
-
-        # Arbeitsphase
-        gantt_data.append({
-            "Name": name,
-            "Start": row["ATZ_Start"].strftime("%Y-%m-%d"),
-            "Ende": row["Phasen_Wechsel"].strftime("%Y-%m-%d"),
-            "Phase": "Arbeitsphase"
-        })
-
-        # Freistellungsphase
-        gantt_data.append({
-            "Name": name,
-            "Start": row["Phasen_Wechsel"].strftime("%Y-%m-%d"),
-            "Ende": row["Renteneintritt"].strftime("%Y-%m-%d"),
-            "Phase": "Freistellungsphase"
-        })
-
-    gantt_df = pd.DataFrame(gantt_data)
+    # Älteste Personen bis MAX_GANTT_BARS für bessere Lesbarkeit
+    atz_timeline = atz_timeline.nlargest(MAX_GANTT_BARS // 2, "Alter")
+
+    # Erstelle Gantt-Daten: Datumsstrings spaltenweise statt pro Zeile formatieren
+    def _name_part(col: str):
+        return atz_timeline[col].astype(str) if col in atz_timeline.columns else "N/A"
+
+    names = (
+        _name_part("Vorname") + " " + _name_part("Nachname")
+        + " (" + atz_timeline["Alter"].astype(int).astype(str) + ")"
+    ).to_numpy()
+    start_s = atz_timeline["ATZ_Start"].dt.strftime("%Y-%m-%d").to_numpy()
+    wechsel_s = atz_timeline["Phasen_Wechsel"].dt.strftime("%Y-%m-%d").to_numpy()
+    ende_s = atz_timeline["Renteneintritt"].dt.strftime("%Y-%m-%d").to_numpy()
+
+    # Je Person zwei Balken (Arbeitsphase, dann Freistellungsphase) im Wechsel
+    gantt_df = pd.DataFrame({
+        "Name": np.repeat(names, 2),
+        "Start": np.column_stack((start_s, wechsel_s)).ravel(),
+        "Ende": np.column_stack((wechsel_s, ende_s)).ravel(),
+        "Phase": np.tile(["Arbeitsphase", "Freistellungsphase"], len(atz_timeline)),
+    })
 
     fig_gantt = create_gantt_chart(
         gantt_df,
@@ -172,30 +200,65 @@ def render_timeline_section(df: pd.DataFrame):
         height=600
     )
 
-    st.plotly_chart(fig_gantt, use_container_width=True)
+    st.plotly_chart(fig_gantt, use_container_width=True, key="atz_timeline")
 
 
-def render_org_breakdown(df: pd.DataFrame, view_mode: str):
-    """Rendert ATZ-Verteilung nach Organisation."""
-    st.markdown("#### 🏢 ATZ-Verteilung nach Organisationseinheit")
+def _org_phase_sums(atz_df: pd.DataFrame, value_col: str) -> pd.DataFrame:
+    """
+    Summiert value_col je (Organisationseinheit, ATZ_Status) über die Kategorie-Codes.
+
+    Ein gewichtetes np.bincount über den kombinierten Code beider Spalten
+    ersetzt groupby([...], observed=True).agg("sum"): gleiche Zeilen (nur
+    vorkommende Kombinationen, in Kategorie-Reihenfolge), fehlende Werte
+    entfallen.
 
-    # Nur ATZ-Mitarbeitende
-    atz_df = df[(~df["Is_Vacant"]) & (df["ATZ_Status"] != "Kein ATZ")]
+    Args:
+        atz_df: DataFrame mit Spalten "Organisationseinheit" und "ATZ_Status"
+        value_col: Zu summierende Spalte (z.B. "FTE_assigned")
+
+    Returns:
+        DataFrame mit Spalten "Organisation", "Phase" und "Wert"
+    """
+    org = atz_df["Organisationseinheit"].astype("category")
+    status = atz_df["ATZ_Status"].astype("category")
+    org_codes = org.cat.codes.to_numpy()
+    status_codes = status.cat.codes.to_numpy()
+    n_status = len(status.cat.categories)
+    values = atz_df[value_col].to_numpy()
+
+    valid = (org_codes >= 0) & (status_codes >= 0)
+    combined = org_codes[valid].astype(np.intp) * n_status + status_codes[valid]
+    minlength = len(org.cat.categories) * n_status
+    counts = np.bincount(combined, minlength=minlength)
+    sums = np.bincount(combined, weights=values[valid], minlength=minlength)
+    observed = np.flatnonzero(counts)
+
+    return pd.DataFrame({
+        "Organisation": pd.Categorical.from_codes(observed // n_status, dtype=org.dtype),
+        "Phase": pd.Categorical.from_codes(observed % n_status, dtype=status.dtype),
+        "Wert": sums[observed].astype(values.dtype),
+    })
+
+
+def render_org_breakdown(atz_df: pd.DataFrame, view_mode: str):
+    """Rendert ATZ-Verteilung nach Organisation (atz_df: besetzte Stellen in ATZ)."""
+    st.markdown("#### 🏢 ATZ-Verteilung nach Organisationseinheit")
 
     if len(atz_df) == 0:
         st.info("Keine ATZ-Mitarbeitenden im ausgewählten Bereich.")
         return
 
     # Aggregiere nach Org und Phase
-    org_phase = atz_df.groupby(["Organisationseinheit", "ATZ_Status"]).agg({
-        "FTE_assigned" if view_mode == "MAK" else "Total_Cost_Year": "sum"
-    }).reset_index()
+    org_phase = _org_phase_sums(atz_df, "FTE_assigned" if view_mode == "MAK" else "Total_Cost_Year")
 
-    org_phase.columns = ["Organisation", "Phase", "Wert"]
-
-    # Top 10 Organisationen
-    top_orgs = org_phase.groupby("Organisation")["Wert"].sum().nlargest(10).index
-    org_phase_filtered = org_phase[org_phase["Organisation"].isin(top_orgs)]
+    # Top 10 Organisationen: Summe je Org per bincount über die Org-Codes der
+    # Aggregation; stabile absteigende Sortierung entspricht nlargest(keep="first")
+    org_codes = org_phase["Organisation"].cat.codes.to_numpy()
+    wert = org_phase["Wert"].to_numpy()
+    org_totals = np.bincount(org_codes, weights=wert).astype(wert.dtype)
+    present = np.unique(org_codes)
+    top_codes = present[np.argsort(-org_totals[present], kind="stable")[:10]]
+    org_phase_filtered = org_phase[np.isin(org_codes, top_codes)]
 
     fig_org = create_bar_chart(
         org_phase_filtered,
@@ -206,7 +269,7 @@ def render_org_breakdown(df: pd.DataFrame, view_mode: str):
         title=""
     )
 
-    st.plotly_chart(fig_org, use_container_width=True)
+    st.plotly_chart(fig_org, use_container_width=True, key="atz_org_breakdown")
 
 
 def render_history_section(history_df: pd.DataFrame):
@@ -248,23 +311,17 @@ def render_history_section(history_df: pd.DataFrame):
         title="Kapazitätsentwicklung (FTE)"
     )
 
-    st.plotly_chart(fig_timeline, use_container_width=True)
+    st.plotly_chart(fig_timeline, use_container_width=True, key="atz_history")
 
 
-def render_detail_table(df: pd.DataFrame, view_mode: str):
-    """Rendert Detail-Tabelle mit Export."""
+def render_detail_table(atz_timeline: pd.DataFrame, view_mode: str):
+    """Rendert Detail-Tabelle mit Export (atz_timeline aus calculate_atz_end_dates)."""
     st.markdown("#### 📋 ATZ-Detailliste")
 
-    # Nur ATZ-Mitarbeitende
-    atz_df = df[(~df["Is_Vacant"]) & (df["ATZ_Status"] != "Kein ATZ")].copy()
-
-    if len(atz_df) == 0:
+    if len(atz_timeline) == 0:
         st.info("Keine ATZ-Mitarbeitenden im ausgewählten Bereich.")
         return
 
-    # Berechne Enddaten
-    atz_timeline = calculate_atz_end_dates(atz_df)
-
     # Auswahl der Spalten
     display_cols = [
         "PersNr",
@@ -356,26 +413,33 @@ def main():
 
         st.divider()
 
-        # Nur besetzte Stellen für Analysen
+        # Nur besetzte Stellen für Analysen; ATZ-Teilmenge einmal für alle Sections
         active_df = filtered_df[~filtered_df["Is_Vacant"]]
+        atz_df = active_df[active_df["ATZ_Status"] != "Kein ATZ"]
+
+        # ATZ-Enddaten einmal berechnen (Timeline und Detail-Tabelle)
+        atz_timeline = calculate_atz_end_dates(atz_df)
 
         # KPI Row
         st.markdown("### 📈 Zentrale Kennzahlen")
 
-        atz_gesamt = len(active_df[active_df["ATZ_Status"] != "Kein ATZ"])
-        atz_arbeitsphase = len(active_df[active_df["ATZ_Status"] == "Arbeitsphase"])
-        atz_freistellung = len(active_df[active_df["ATZ_Status"] == "Freistellungsphase"])
-        atz_berechtigt = len(active_df[active_df["Alter"] >= 55])
+        # Funnel-Zählungen einmal bilden (KPIs und Funnel-Section)
+        atz_counts = calculate_atz_counts(active_df)
+        atz_gesamt = atz_counts["in_atz"]
+        atz_arbeitsphase = atz_counts["arbeitsphase"]
+        atz_freistellung = atz_counts["freistellung"]
+        atz_berechtigt = atz_counts["berechtigt"]
+        n_active = atz_counts["total"]
 
         if view_mode == "MAK":
-            atz_fte = active_df[active_df["ATZ_Status"] != "Kein ATZ"]["FTE_assigned"].sum()
+            atz_fte = atz_df["FTE_assigned"].sum()
             atz_value = format_value(atz_fte, "MAK")
         else:
-            atz_cost = active_df[active_df["ATZ_Status"] != "Kein ATZ"]["Total_Cost_Year"].sum()
+            atz_cost = atz_df["Total_Cost_Year"].sum()
             atz_value = format_value(atz_cost, "Euro")
 
         # ATZ-Quote Status
-        atz_quote = (atz_gesamt / len(active_df)) if len(active_df) > 0 else 0
+        atz_quote = (atz_gesamt / n_active) if n_active else 0
         atz_status = "good" if atz_quote <= THRESHOLDS["atz_quote"]["good"] else \
                      "warning" if atz_quote <= THRESHOLDS["atz_quote"]["warning"] else \
                      "critical"
@@ -391,21 +455,21 @@ def main():
             {
                 "title": "Arbeitsphase",
                 "value": str(atz_arbeitsphase),
-                "subtitle": f"{(atz_arbeitsphase/atz_gesamt*100) if atz_gesamt > 0 else 0:.1f}% der ATZ",
+                "subtitle": f"{_percent(atz_arbeitsphase, atz_gesamt):.1f}% der ATZ",
                 "icon": "💼",
                 "status": "good"
             },
             {
                 "title": "Freistellungsphase",
                 "value": str(atz_freistellung),
-                "subtitle": f"{(atz_freistellung/atz_gesamt*100) if atz_gesamt > 0 else 0:.1f}% der ATZ",
+                "subtitle": f"{_percent(atz_freistellung, atz_gesamt):.1f}% der ATZ",
                 "icon": "🏖️",
                 "status": "good"
             },
             {
                 "title": "ATZ-Berechtigt (55+)",
                 "value": str(atz_berechtigt),
-                "subtitle": f"{(atz_berechtigt/len(active_df)*100) if len(active_df) > 0 else 0:.1f}% der Belegschaft",
+                "subtitle": f"{_percent(atz_berechtigt, n_active):.1f}% der Belegschaft",
                 "icon": "👥"
             }
         ]
@@ -415,7 +479,7 @@ def main():
         st.divider()
 
         # Funnel Section
-        render_funnel_section(filtered_df)
+        render_funnel_section(atz_counts)
 
         st.divider()
 
@@ -423,10 +487,10 @@ def main():
         col1, col2 = st.columns([1.2, 1])
 
         with col1:
-            render_timeline_section(filtered_df)
+            render_timeline_section(atz_timeline)
 
         with col2:
-            render_org_breakdown(filtered_df, view_mode)
+            render_org_breakdown(atz_df, view_mode)
 
         st.divider()
 
@@ -436,7 +500,7 @@ def main():
         st.divider()
 
         # Detail Table
-        render_detail_table(filtered_df, view_mode)
+        render_detail_table(atz_timeline, view_mode)
 
         # Debug-Info (expandable)
         with st.expander("🔍 Debug: ATZ-Statistiken"):
@@ -444,7 +508,7 @@ def main():
             st.write(active_df["ATZ_Status"].value_counts())
 
             st.write("**ATZ nach Alter:**")
-            atz_age = active_df[active_df["ATZ_Status"] != "Kein ATZ"]["Alter"].describe()
+            atz_age = atz_df["Alter"].describe()
             st.write(atz_age)
 
     except FileNotFoundError:
@@ -10,7 +10,9 @@ import sys
 import os
 
 # Import components
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:  # Seiten laufen bei jedem Rerun erneut
+    sys.path.append(_ROOT)
 from data.loader import load_and_prepare_data
 from components.sidebar import render_global_filters, apply_filters, get_filter_summary
 from components.kpi_card import kpi_card
@@ -239,7 +241,7 @@ def render_overview_section():
     st.subheader("📊 Gesamtübersicht")
 
     # Aggregiere Daten pro Org-Einheit
-    org_summary = filtered_df.groupby("Kürzel OrgEinheit").agg({
+    org_summary = filtered_df.groupby("Kürzel OrgEinheit", observed=True).agg({
         "Soll_FTE": "sum",
         "FTE_assigned": "sum",
         "Total_Cost_Year": "sum",
@@ -259,7 +261,7 @@ def render_overview_section():
 
     # Bereite Daten für Sunburst vor
     sunburst_df = org_summary.copy()
-    sunburst_df["path"] = sunburst_df["Kürzel"].astype(str) + " - " + sunburst_df["Name"]
+    sunburst_df["path"] = sunburst_df["Kürzel"].astype(str) + " - " + sunburst_df["Name"].astype(str)
 
     fig_sunburst = create_sunburst(
         df=sunburst_df,
@@ -270,7 +272,7 @@ def render_overview_section():
         height=600
     )
 
-    st.plotly_chart(fig_sunburst, use_container_width=True)
+    st.plotly_chart(fig_sunburst, use_container_width=True, key="org_sunburst")
 
     st.caption("💡 Größe = Kapazität/Kosten | Farbe = Besetzungsgrad | Klick auf Segment für Details")
 
@@ -288,7 +290,7 @@ def render_overview_section():
             title="",
             height=300
         )
-        st.plotly_chart(fig_top, use_container_width=True)
+        st.plotly_chart(fig_top, use_container_width=True, key="org_top_units")
 
     with col2:
         st.markdown("##### ⚠️ Höchste Unterdeckung")
@@ -305,7 +307,7 @@ def render_overview_section():
             title="Varianz in %",
             height=300
         )
-        st.plotly_chart(fig_flop, use_container_width=True)
+        st.plotly_chart(fig_flop, use_container_width=True, key="org_flop_units")
 
 
 def render_unit_detail_section(org_unit: str):
@@ -397,7 +399,7 @@ def render_unit_detail_section(org_unit: str):
             title="",
             height=400
         )
-        st.plotly_chart(fig_waterfall, use_container_width=True)
+        st.plotly_chart(fig_waterfall, use_container_width=True, key="org_waterfall")
 
     with col2:
         st.markdown("#### 📊 Verteilung nach Geschlecht")
@@ -406,7 +408,7 @@ def render_unit_detail_section(org_unit: str):
         df_org_active = df_org[~df_org["Is_Vacant"]]
 
         if not df_org_active.empty:
-            gender_dist = df_org_active.groupby("Geschlecht").agg({
+            gender_dist = df_org_active.groupby("Geschlecht", observed=True).agg({
                 "FTE_assigned": "sum" if view_mode == "MAK" else "count",
                 "Total_Cost_Year": "sum"
             }).reset_index()
@@ -420,7 +422,7 @@ def render_unit_detail_section(org_unit: str):
                 title="",
                 height=400
             )
-            st.plotly_chart(fig_gender, use_container_width=True)
+            st.plotly_chart(fig_gender, use_container_width=True, key="org_unit_gender")
         else:
             st.info("Keine besetzten Stellen vorhanden")
 
@@ -462,7 +464,7 @@ def render_unit_detail_section(org_unit: str):
     df_display["Ist FTE"] = df_display["Ist FTE"].round(2)
     df_display["Kosten p.a. €"] = df_display["Kosten p.a. €"].apply(lambda x: f"{x:,.0f}" if pd.notna(x) else "")
     df_display["Vakant"] = df_display["Vakant"].map({True: "✓", False: ""})
-    df_display["Geschlecht"] = df_display["Geschlecht"].fillna("")
+    df_display["Geschlecht"] = df_display["Geschlecht"].astype(object).fillna("")
 
     st.dataframe(
         df_display,
@@ -793,7 +795,7 @@ with tab3:
     st.markdown("#### 🎯 Qualifikationsverteilung nach Org-Einheiten")
 
     # Top 8 Qualifikationen ermitteln
-    top_qualifications = filtered_df[~filtered_df["Is_Vacant"]]["Ausbildung"].value_counts().head(8).index.tolist()
+    top_qualifications = filtered_df[~filtered_df["Is_Vacant"]]["Ausbildung"].value_counts()[lambda counts: counts > 0].head(8).index.tolist()
 
     # Bereite Daten für Heatmap vor
     qual_heatmap_data = []
@@ -935,7 +937,7 @@ with tab3:
         st.markdown("##### 📚 Qualifikations-Mix Top 5 Einheiten")
 
         # Top 5 Einheiten nach Größe
-        top_5_orgs = filtered_df[~filtered_df["Is_Vacant"]].groupby("Kürzel OrgEinheit").size().nlargest(5).index.tolist()
+        top_5_orgs = filtered_df[~filtered_df["Is_Vacant"]].groupby("Kürzel OrgEinheit", observed=True).size().nlargest(5).index.tolist()
 
         # Erstelle Stacked Bar für Top 5
         qual_mix_data = []
@@ -945,7 +947,7 @@ with tab3:
                 (~filtered_df["Is_Vacant"])
             ]
 
-            qual_counts = df_org["Ausbildung"].value_counts().head(5)
+            qual_counts = df_org["Ausbildung"].value_counts()[lambda counts: counts > 0].head(5)
             total = len(df_org)
 
             for qual, count in qual_counts.items():
@@ -11,7 +11,9 @@ import sys
 import os
 
 # Import components
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:  # Seiten laufen bei jedem Rerun erneut
+    sys.path.append(_ROOT)
 from data.loader import load_and_prepare_data
 from components.sidebar import render_global_filters, apply_filters, get_filter_summary
 from components.toggle import format_value
@@ -177,7 +179,7 @@ def render_analysis_tab(df: pd.DataFrame, view_mode: str, stats: dict):
             value_col="Planstellennr",
             title=""
         )
-        st.plotly_chart(fig_heatmap, use_container_width=True)
+        st.plotly_chart(fig_heatmap, use_container_width=True, key="jobfamily_org_heatmap")
         st.caption("💡 Top 10 Jobfamilies × Top 10 Org-Einheiten")
     else:
         st.info("Nicht genügend Daten für Heatmap")
@@ -190,7 +192,7 @@ def render_analysis_tab(df: pd.DataFrame, view_mode: str, stats: dict):
     family_gender_data = active_df[active_df["Jobfamily"].isin(top_5_families)]
 
     if not family_gender_data.empty:
-        family_gender = family_gender_data.groupby(["Jobfamily", "Geschlecht"]).size().reset_index(name="Anzahl")
+        family_gender = family_gender_data.groupby(["Jobfamily", "Geschlecht"], observed=True).size().reset_index(name="Anzahl")
 
         fig_gender = go.Figure()
         for gender in ["w", "m"]:
@@ -12,7 +12,9 @@ from datetime import datetime
 from dateutil.relativedelta import relativedelta
 
 # Import components
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:  # Seiten laufen bei jedem Rerun erneut
+    sys.path.append(_ROOT)
 from data.loader import load_and_prepare_data
 from components.sidebar import render_global_filters, apply_filters, get_filter_summary
 from components.kpi_card import kpi_card
@@ -338,7 +340,7 @@ def render_simulation_results(results_df: pd.DataFrame, scenario_name: str, view
             title="",
             height=400
         )
-        st.plotly_chart(fig_main, use_container_width=True)
+        st.plotly_chart(fig_main, use_container_width=True, key=f"sim_main_{scenario_name}")
 
     with col2:
         st.markdown("#### 📭 Vakanzen-Entwicklung")
@@ -350,7 +352,7 @@ def render_simulation_results(results_df: pd.DataFrame, scenario_name: str, view
             title="",
             height=400
         )
-        st.plotly_chart(fig_vac, use_container_width=True)
+        st.plotly_chart(fig_vac, use_container_width=True, key=f"sim_vacancies_{scenario_name}")
 
     # Events Timeline (if available)
     if "retirements" in results_df.columns:
@@ -372,7 +374,7 @@ def render_simulation_results(results_df: pd.DataFrame, scenario_name: str, view
             title="",
             height=400
         )
-        st.plotly_chart(fig_events, use_container_width=True)
+        st.plotly_chart(fig_events, use_container_width=True, key=f"sim_events_{scenario_name}")
 
 
 def render_monte_carlo_results(mc_results: dict, scenario_name: str, view_mode: str = "MAK"):
@@ -88,6 +88,31 @@ def assign_age_cohort(age: float, cohort_definitions: Dict[str, Tuple[int, int]]
     return "Unknown"
 
 
+def assign_age_cohorts(ages, cohort_definitions: Dict[str, Tuple[int, int]]) -> np.ndarray:
+    """
+    Weist einem Array von Altern vektorisiert Kohorten zu.
+
+    Entspricht assign_age_cohort je Element: Grenzen inklusive, erste passende
+    Kohorte gewinnt, NaN und nicht zugeordnete Alter werden "Unknown".
+
+    Args:
+        ages: Alter in Jahren (float, NaN erlaubt)
+        cohort_definitions: Dict mit {name: (min_age, max_age)}
+
+    Returns:
+        Array mit Kohorten-Namen
+    """
+    ages = np.asarray(ages, dtype=np.float64)
+    if not cohort_definitions:
+        return np.full(len(ages), "Unknown", dtype=object)
+
+    return np.select(
+        [(ages >= min_age) & (ages <= max_age) for min_age, max_age in cohort_definitions.values()],
+        list(cohort_definitions.keys()),
+        default="Unknown"
+    ).astype(object)
+
+
 def calculate_age_at_date(birth_date: datetime, reference_date: datetime) -> float:
     """
     Berechnet Alter zum Stichtag.
@@ -177,9 +202,7 @@ def calculate_attrition(
     df_active["Current_Age"] = df_active["GebDatum"].apply(
         lambda x: calculate_age_at_date(x, current_date)
     )
-    df_active["Age_Cohort"] = df_active["Current_Age"].apply(
-        lambda x: assign_age_cohort(x, cohort_definitions)
-    )
+    df_active["Age_Cohort"] = assign_age_cohorts(df_active["Current_Age"], cohort_definitions)
 
     attritions = []
 